@@ -0,0 +1,18 @@
+"""
+IPO covering array generator
+The engine, coverage tracking and verification import with NumPy alone. Plotting lives in ipo.plots, which is
+the only module that needs matplotlib and is not imported here.
+"""
+from .coverage import column_sizes, radix_weights, DC, CoverageState, comb_chunks, max_interactions
+from .constraints import Constraints, as_constraints
+from .verify import CoverageReport, is_covering_array, interaction_counts, unique_coverage
+from .postprocess import (fill_dc, reduce_rows, StreamedRow, stream_rows, order_rows, coverage_curve,
+                          rows_for_coverage, AnnealResult, MIN_TEMPERATURE, anneal)
+from .engine import (GrowthTables, SEARCH_STRATEGIES, exhaustive_search, beam_search, greedy_search,
+                     horizontal_growth, vertical_growth, stride_steps, tapered_stride, new_combinations, grow, ipo,
+                     extend, ipo_stream, IPO, IPO_2, IPO_3, IPO_4, IPO_5, IPO_6, IPO_8, IPO_12)
+from .profiling import PHASES, StepProfile, GrowthProfile
+from .storage import StoredArray, save_array, load_array, iter_rows, ArrayCache
+from .bench import (measure_peak_memory, estimate_memory, SizeStats, iter_trials, run_trials, BestArray, best_of,
+                    run_variants, run_tests_2, run_tests, run_tests_factors, SUITE_GRID, SUITE_VARIANTS, run_suite,
+                    suite_summary, save_suite, load_suite, Regression, compare_suite, print_suite, check_import_time)
@@ -0,0 +1,396 @@
+import numpy as np
+import math
+from collections import namedtuple
+import os
+import sys
+import time
+import json
+import platform
+import subprocess
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from .coverage import column_sizes, max_interactions
+from .engine import ipo, stride_steps, SEARCH_STRATEGIES, CANDIDATE_CHUNK, CANDIDATE_CELLS
+
+"""
+Benchmarks
+Array size statistics over many seeded trials run in worker processes, best-of-n search, memory and startup costs
+"""
+
+"""
+Runs fn(*args, **kwargs) under tracemalloc and returns its result and the peak memory in bytes allocated while it ran,
+NumPy arrays included, which is what a worker running it needs on top of the interpreter
+"""
+def measure_peak_memory(fn,*args,**kwargs):
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    before = tracemalloc.get_traced_memory()[0]
+    try:
+        result = fn(*args, **kwargs)
+    finally:
+        peak = tracemalloc.get_traced_memory()[1] - before
+        if started:
+            tracemalloc.stop()
+    return result, peak
+
+
+"""
+Rough peak memory of ipo in bytes without running it, taken at the largest growth step: the coverage bits and
+index arrays of the combinations holding a new column plus one batch of exhaustive candidate scores.
+The covering array itself and the Python overhead are left out, measure_peak_memory gives the real figure.
+"""
+def estimate_memory(t,k,v,stride=1):
+    sizes = np.sort(column_sizes(v,k))[::-1]
+    size = max_interactions(sizes,t)
+    peak = 0
+    for i, num_rows in stride_steps(t,k,stride):
+        combs = math.comb(i+num_rows,t) - math.comb(i,t)
+        #one byte of coverage per interaction, twelve index arrays of t entries and three of one entry per combination
+        state = combs * (size + (12 * t + 3) * np.dtype(np.intp).itemsize)
+        candidates = min(math.prod(sizes[i:i+num_rows].tolist()), CANDIDATE_CHUNK, max(1, CANDIDATE_CELLS // max(combs, 1)))
+        #gathered new values, new parts, encoded interactions and their coverage for a batch of candidates
+        scores = candidates * combs * ((t + 2) * np.dtype(np.intp).itemsize + 1)
+        peak = max(peak, state + scores)
+    return int(peak)
+
+
+"""
+Streaming statistics of the array sizes found by a benchmark
+Keeps the running mean and variance (Welford) and a histogram of sizes, so percentiles
+are exact while memory only grows with the number of distinct sizes
+"""
+class SizeStats:
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.counts = {}
+
+    def add(self,size):
+        self.n += 1
+        delta = size - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (size - self.mean)
+        self.counts[size] = self.counts.get(size, 0) + 1
+
+    def min(self):
+        return min(self.counts)
+
+    def max(self):
+        return max(self.counts)
+
+    def std(self):
+        if self.n < 2:
+            return 0.0
+        return math.sqrt(self.m2 / (self.n - 1))
+
+    #smallest size such that at least q percent of the trials are no larger
+    def percentile(self,q):
+        target = q / 100 * self.n
+        seen = 0
+        for size in sorted(self.counts):
+            seen += self.counts[size]
+            if seen >= target:
+                return size
+        return self.max()
+
+    #half width of the normal confidence interval on the mean, 1.96 gives 95%
+    def ci_half_width(self,z=1.96):
+        if self.n < 2:
+            return math.inf
+        return z * self.std() / math.sqrt(self.n)
+
+    def summary(self):
+        return ('Min = ' + str(self.min()) + ' Mean = ' + str(round(self.mean, 3)) + ' Std = ' + str(round(self.std(), 3))
+                + ' P50 = ' + str(self.percentile(50)) + ' P95 = ' + str(self.percentile(95)) + ' Trials = ' + str(self.n))
+
+
+"""
+One benchmark trial, runs in a worker process
+Builds the array from the trial's own seed and returns only its size
+"""
+def trial_size(t,k,v,stride,strategy,beam_width,seed):
+    return len(ipo(t,k,v,stride,strategy,beam_width,seed))
+
+
+"""
+Runs trial(*args, seed) for up to num_iter seeds and yields (seed, result) pairs in trial order
+Trial i uses the i-th child spawned from SeedSequence(seed), so trials are independent streams. Results that finish
+early are held back until the trials before them are done, so the sequence, and the point where a caller that stops on
+it stops, are the same whatever the number of workers. Trials are spread over a process pool of the given number of
+workers (all cores when None, in-process when 1). Only a bounded window of trials is in flight or held back, so a
+caller that stops iterating early does not leave a long queue behind, the remaining trials are cancelled.
+"""
+def iter_trials(trial,args,num_iter,workers=None,seed=None):
+    seeds = np.random.SeedSequence(seed)
+
+    if workers == 1:
+        for i in range(num_iter):
+            child = seeds.spawn(1)[0]
+            yield child, trial(*args, child)
+        return
+
+    with ProcessPoolExecutor(workers) as pool:
+        window = 4 * (workers or os.cpu_count() or 1)
+        submitted = 0
+        pending = {}
+        #finished trials by index, waiting for the ones before them
+        done = {}
+        next_trial = 0
+        try:
+            while next_trial < num_iter:
+                while submitted < num_iter and len(pending) + len(done) < window:
+                    child = seeds.spawn(1)[0]
+                    pending[pool.submit(trial, *args, child)] = (submitted, child)
+                    submitted += 1
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for f in finished:
+                    i, child = pending.pop(f)
+                    done[i] = (child, f.result())
+                while next_trial in done:
+                    yield done.pop(next_trial)
+                    next_trial += 1
+        finally:
+            for f in pending:
+                f.cancel()
+
+
+"""
+Runs num_iter independent IPO trials and aggregates the array sizes as they arrive, see iter_trials for workers and seed
+With ci_tol set, stops early once at least min_trials are done and the 95% confidence interval on the mean
+is narrower than +/- ci_tol rows, trials being counted in seed order so the result does not depend on workers.
+stride must be picklable when workers are used, so pass a number or a sequence rather than a local function.
+"""
+def run_trials(num_iter,t,k,v,stride=1,strategy='exhaustive',beam_width=8,workers=None,seed=0,ci_tol=None,min_trials=30):
+    stats = SizeStats()
+    trials = iter_trials(trial_size,(t,k,v,stride,strategy,beam_width),num_iter,workers,seed)
+    for _, size in trials:
+        stats.add(size)
+        if ci_tol is not None and stats.n >= min_trials and stats.ci_half_width() <= ci_tol:
+            trials.close()
+            break
+    return stats
+
+
+"""
+Result of best_of, the smallest array found, the seed that rebuilds it with ipo and the number of trials run
+"""
+BestArray = namedtuple('BestArray', ['ca', 'seed', 'trials'])
+
+
+"""
+Best-of-n search
+Runs up to n IPO trials of the given variant (a stride, see stride_steps) and keeps only the smallest array
+and its seed, so memory does not grow with n. Trials can run in parallel, see iter_trials for workers and seed.
+Stops early once time_budget seconds have passed or an array reaches the lower bound v**t
+(the product of the t largest alphabet sizes for per-column sizes).
+Passing the returned seed back to ipo with the same arguments rebuilds the array.
+"""
+def best_of(n,t,k,v,variant=1,strategy='exhaustive',beam_width=8,seed=None,workers=1,time_budget=None):
+    start = time.perf_counter()
+    lower_bound = max_interactions(column_sizes(v,k),t)
+    best = BestArray(None, None, 0)
+    trials = iter_trials(ipo,(t,k,v,variant,strategy,beam_width),n,workers,seed)
+    for child, ca in trials:
+        if best.ca is None or len(ca) < len(best.ca):
+            best = BestArray(ca, child, best.trials + 1)
+        else:
+            best = best._replace(trials=best.trials + 1)
+        if len(best.ca) <= lower_bound or (time_budget is not None and time.perf_counter() - start >= time_budget):
+            trials.close()
+            break
+    return best
+
+
+"""
+Testing Function
+Runs num_iter trials of each stride for every [t,k,v] in arrays and prints the size statistics
+"""
+def run_variants(num_iter,arrays,strides,workers=None,ci_tol=None):
+    for arr in arrays:
+        t = arr[0]
+        k = arr[1]
+        v = arr[2]
+        for stride in strides:
+            stats = run_trials(num_iter,t,k,v,stride,workers=workers,ci_tol=ci_tol)
+            print('IPO '+ str(stride) +': ' + stats.summary())
+
+
+def run_tests_2(num_iter,arrays,workers=None,ci_tol=None):
+    run_variants(num_iter,arrays,[1,2],workers,ci_tol)
+
+
+def run_tests(num_iter,arrays,workers=None,ci_tol=None):
+    run_variants(num_iter,arrays,[1,2,3,4,5],workers,ci_tol)
+
+
+def run_tests_factors(num_iter,arrays,workers=None,ci_tol=None):
+    run_variants(num_iter,arrays,[1,2,3,4,6,8,12],workers,ci_tol)
+
+
+#(t, k, v) configurations of the benchmark suite, the paper's tables first, then larger and mixed-alphabet arrays
+SUITE_GRID = [(2,10,3), (3,10,3), (2,10,2), (2,12,2), (2,16,2), (2,30,3), (2,26,2),
+              (3,30,3), (2,60,4), (4,12,2), (2,20,[6,5,4,4,3,3,3,3,2,2,2,2,2,2,2,2,2,2,2,2])]
+SUITE_VARIANTS = (1,2,3,4,5,6,8,12)
+#exhaustive runs of a variant are skipped when a row has more candidates than this
+SUITE_MAX_CANDIDATES = 4096
+
+
+"""
+One benchmark run, the array size, wall and CPU time of ipo for one seed, and its peak memory from a second run
+with the same seed under tracemalloc, so that tracing does not slow down the timed run
+"""
+def suite_run(t,k,v,variant,strategy,seed):
+    wall = time.perf_counter()
+    cpu = time.process_time()
+    ca = ipo(t,k,v,variant,strategy,seed=seed)
+    wall = time.perf_counter() - wall
+    cpu = time.process_time() - cpu
+    _, peak = measure_peak_memory(ipo,t,k,v,variant,strategy,seed=seed)
+    return {'t': t, 'k': k, 'v': v, 'variant': variant, 'strategy': strategy, 'seed': seed,
+            'N': len(ca), 'wall': wall, 'cpu': cpu, 'peak_bytes': peak}
+
+
+"""
+Benchmark suite over grid x variants x strategies, repeats seeded runs each (seeds 0 to repeats-1)
+Runs one at a time so that timings do not compete for cores, and returns a JSON-ready dict with the machine it ran on
+and every run (see suite_run). Exhaustive runs with more than SUITE_MAX_CANDIDATES candidates per row are skipped.
+Progress goes to stderr when verbose is set.
+"""
+def run_suite(grid=SUITE_GRID,variants=SUITE_VARIANTS,strategies=tuple(SEARCH_STRATEGIES),repeats=3,verbose=False):
+    runs = []
+    for t, k, v in grid:
+        largest = int(max(column_sizes(v,k)))
+        for variant in variants:
+            for strategy in strategies:
+                if strategy == 'exhaustive' and largest ** min(variant, k-t) > SUITE_MAX_CANDIDATES:
+                    continue
+                for seed in range(repeats):
+                    runs.append(suite_run(t,k,v,variant,strategy,seed))
+                if verbose:
+                    print(suite_key(runs[-1]) + ' N = ' + str(runs[-1]['N']) + ' ' + str(round(runs[-1]['wall'], 3)) + ' s',
+                          file=sys.stderr)
+    return {'machine': {'python': platform.python_version(), 'numpy': np.__version__, 'platform': platform.platform(),
+                        'cpus': os.cpu_count(), 'date': time.strftime('%Y-%m-%d %H:%M:%S')},
+            'runs': runs}
+
+
+"""
+Name of the configuration of a run, like CA(2,10,3) IPO 2 exhaustive
+"""
+def suite_key(run):
+    v = run['v'] if isinstance(run['v'], int) else '[' + ','.join(map(str, run['v'])) + ']'
+    return ('CA(' + str(run['t']) + ',' + str(run['k']) + ',' + str(v) + ') IPO ' + str(run['variant']) + ' '
+            + run['strategy'])
+
+
+"""
+Aggregates the runs of a suite by configuration: mean and minimum N, median wall and CPU time, minimum CPU time
+and largest peak memory.
+With seeds given, only the runs of those seeds of each configuration are counted.
+"""
+def suite_summary(suite,seeds=None):
+    groups = {}
+    for run in suite['runs']:
+        if seeds is None or run['seed'] in seeds.get(suite_key(run), ()):
+            groups.setdefault(suite_key(run), []).append(run)
+    summary = {}
+    for key, runs in groups.items():
+        summary[key] = {'N': float(np.mean([run['N'] for run in runs])), 'min_N': min(run['N'] for run in runs),
+                        'wall': float(np.median([run['wall'] for run in runs])),
+                        'cpu': float(np.median([run['cpu'] for run in runs])),
+                        'min_cpu': min(run['cpu'] for run in runs),
+                        'peak_bytes': max(run['peak_bytes'] for run in runs), 'runs': len(runs)}
+    return summary
+
+
+"""
+Writes a suite to a JSON file, which can serve as the baseline of later runs
+"""
+def save_suite(suite,path):
+    with open(path, 'w') as f:
+        json.dump(suite, f, indent=1)
+
+
+"""
+Reads a suite written by save_suite
+"""
+def load_suite(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+Regression = namedtuple('Regression', ['key', 'metric', 'baseline', 'current'])
+
+
+"""
+Compares a suite with a baseline suite and returns a Regression for each configuration of both where the mean N grew
+by more than size_tol rows, or the fastest CPU time or the peak memory grew by more than time_tol or memory_tol
+(fractions of the baseline). The fastest CPU time is compared rather than the median wall time as it is the least
+sensitive to machine load, and baseline times under min_seconds or peaks under min_bytes are ignored as noise.
+"""
+def compare_suite(suite,baseline,size_tol=0.0,time_tol=0.25,memory_tol=0.25,min_seconds=0.05,min_bytes=1<<20):
+    #configurations are compared on the seeds both suites ran, the arrays of those are the same unless the engine changed
+    seeds = {}
+    for runs in (suite['runs'], baseline['runs']):
+        found = {}
+        for run in runs:
+            found.setdefault(suite_key(run), set()).add(run['seed'])
+        seeds = found if not seeds else {key: seeds[key] & found[key] for key in seeds if key in found}
+    current = suite_summary(suite,seeds)
+    regressions = []
+    for key, base in suite_summary(baseline,seeds).items():
+        if key not in current:
+            continue
+        now = current[key]
+        if now['N'] > base['N'] + size_tol:
+            regressions.append(Regression(key, 'N', base['N'], now['N']))
+        if base['min_cpu'] >= min_seconds and now['min_cpu'] > base['min_cpu'] * (1 + time_tol):
+            regressions.append(Regression(key, 'cpu', base['min_cpu'], now['min_cpu']))
+        if base['peak_bytes'] >= min_bytes and now['peak_bytes'] > base['peak_bytes'] * (1 + memory_tol):
+            regressions.append(Regression(key, 'peak_bytes', base['peak_bytes'], now['peak_bytes']))
+    return regressions
+
+
+"""
+Prints the summary of a suite as a table, one line per configuration, to file (stdout by default)
+"""
+def print_suite(suite,file=None):
+    for key, row in suite_summary(suite).items():
+        print(key + ': N = ' + str(round(row['N'], 2)) + ' (min ' + str(row['min_N']) + ') wall = '
+              + str(round(row['wall'], 3)) + ' s cpu = ' + str(round(row['cpu'], 3)) + ' s peak = '
+              + str(round(row['peak_bytes'] / 2**20, 1)) + ' MB', file=file)
+
+
+#seconds importing the package may take in a fresh interpreter, NumPy included
+IMPORT_BUDGET = 0.5
+#modules too heavy to be pulled in by importing the package
+HEAVY_MODULES = ('matplotlib', 'scipy', 'pandas')
+
+
+ImportCost = namedtuple('ImportCost', ['seconds', 'heavy', 'ok'])
+
+
+"""
+Startup cost of a module, which every worker process and every command-line call pays
+Imports module in runs fresh interpreters and returns an ImportCost with the median import time in seconds,
+the HEAVY_MODULES it pulled in, and whether it is within budget and pulled in none of them
+"""
+def check_import_time(module='ipo',budget=IMPORT_BUDGET,runs=5):
+    code = ('import sys, time\n'
+            'start = time.perf_counter()\n'
+            'import ' + module + '\n'
+            'print(time.perf_counter() - start)\n'
+            'print(" ".join(m for m in ' + repr(HEAVY_MODULES) + ' if m in sys.modules))\n')
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    times = []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, '-c', code], cwd=root, capture_output=True, text=True, check=True).stdout
+        seconds, heavy = out.split('\n')[:2]
+        times.append(float(seconds))
+    seconds = float(np.median(times))
+    heavy = tuple(heavy.split())
+    return ImportCost(seconds, heavy, seconds <= budget and not heavy)
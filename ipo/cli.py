@@ -0,0 +1,269 @@
+import numpy as np
+import argparse
+import io
+import json
+import os
+import sys
+import time
+from .coverage import column_sizes
+from .verify import is_covering_array
+from .postprocess import order_rows, anneal
+from .engine import ipo, SEARCH_STRATEGIES
+from .profiling import GrowthProfile
+from .storage import save_array, load_array
+from .bench import measure_peak_memory, estimate_memory, run_trials, SUITE_GRID, SUITE_VARIANTS, run_suite, save_suite, load_suite, compare_suite, print_suite
+
+"""
+Command line
+python -m ipo generate | verify | bench, for test orchestrators that call the generator from a shell.
+Arrays and results go to stdout (or a file), timings go to stderr so they never mix with the output.
+"""
+
+FORMATS = ('csv', 'npy', 'json', 'ca')
+
+
+"""
+Parses an alphabet size argument, one size for every column ("3") or one per column ("3,3,2,2")
+"""
+def parse_sizes(text):
+    sizes = [int(size) for size in text.split(',')]
+    return sizes[0] if len(sizes) == 1 else sizes
+
+
+"""
+Parses a comma separated list of integers, like the variants "1,2,3"
+"""
+def parse_ints(text):
+    return [int(x) for x in text.split(',')]
+
+
+"""
+Parses a comma separated list of names, like the strategies "exhaustive,beam"
+"""
+def parse_names(text):
+    return text.split(',')
+
+
+"""
+Format of a file from its extension, csv when the extension is not one of FORMATS
+"""
+def format_of(path):
+    ext = os.path.splitext(path)[1].lstrip('.').lower()
+    return ext if ext in FORMATS else 'csv'
+
+
+"""
+Prints a timing or an error to stderr
+"""
+def report(text):
+    print(text, file=sys.stderr)
+
+
+"""
+Writes an array to path ('-' for stdout) in the given format, json wraps the rows with t, k, v, seed and variant
+"""
+def write_array(ca,path,fmt,t,v,seed,variant):
+    if fmt == 'ca':
+        if path == '-':
+            raise ValueError('the ca format needs an output file')
+        save_array(path,ca,t,v,seed,variant)
+        return
+
+    out = sys.stdout.buffer if path == '-' else open(path, 'wb')
+    try:
+        if fmt == 'npy':
+            np.save(out, np.asarray(ca))
+        elif fmt == 'json':
+            doc = {'t': t, 'k': ca.shape[1], 'v': column_sizes(v,ca.shape[1]).tolist(), 'seed': seed,
+                   'variant': variant, 'rows': np.asarray(ca).tolist()}
+            out.write(json.dumps(doc).encode() + b'\n')
+        else:
+            out.write(''.join(','.join(map(str, row)) + '\n' for row in np.asarray(ca).tolist()).encode())
+    finally:
+        if out is not sys.stdout.buffer:
+            out.close()
+
+
+"""
+Reads an array from path ('-' for stdin) in the given format, guessed from the extension when None
+Returns the array and the t and v stored with it (None for formats that do not keep them)
+"""
+def read_array(path,fmt=None):
+    fmt = fmt or ('csv' if path == '-' else format_of(path))
+    if fmt == 'ca':
+        if path == '-':
+            raise ValueError('the ca format needs an input file')
+        stored = load_array(path)
+        return stored.ca, stored.t, stored.v
+    source = sys.stdin.buffer if path == '-' else path
+    if fmt == 'npy':
+        #np.load needs to seek, which a pipe cannot
+        if path == '-':
+            return np.load(io.BytesIO(sys.stdin.buffer.read())), None, None
+        return np.load(source, mmap_mode='r'), None, None
+    if fmt == 'json':
+        if path == '-':
+            doc = json.load(sys.stdin)
+        else:
+            with open(path) as f:
+                doc = json.load(f)
+        if isinstance(doc, list):
+            return np.array(doc, dtype=np.intp).reshape(len(doc), -1), None, None
+        return np.array(doc['rows'], dtype=np.intp).reshape(len(doc['rows']), -1), doc.get('t'), doc.get('v')
+    return np.loadtxt(source, delimiter=',', dtype=np.intp, ndmin=2), None, None
+
+
+"""
+generate subcommand, writes one array and reports the time taken to build it, with --profile also the time of each
+growth phase per step and the peak memory of the generation (measured under tracemalloc, which slows it down), and
+with --anneal the rows annealing removed
+"""
+def generate(args):
+    profile = GrowthProfile() if args.profile else None
+    start = time.perf_counter()
+    if profile is None:
+        ca = ipo(args.t,args.k,args.v,args.variant,args.strategy,args.beam_width,args.seed,args.compact,args.fill)
+    else:
+        ca, peak = measure_peak_memory(ipo,args.t,args.k,args.v,args.variant,args.strategy,args.beam_width,args.seed,
+                                       args.compact,args.fill,profile=profile)
+    if args.anneal:
+        result = anneal(ca,args.t,args.v,args.anneal,args.seed)
+        report('anneal: N = ' + str(result.initial_rows) + ' -> ' + str(result.rows) + ', ' + str(result.moves) +
+               ' moves in ' + str(round(result.seconds, 3)) + ' s')
+        ca = result.ca
+    if args.order:
+        ca = order_rows(ca,args.t,args.v)
+    elapsed = time.perf_counter() - start
+    write_array(ca,args.output,args.format or format_of(args.output),args.t,args.v,args.seed,args.variant)
+    report('generate: N = ' + str(len(ca)) + ' k = ' + str(args.k) + ' in ' + str(round(elapsed, 3)) + ' s')
+    if profile is not None:
+        report(profile.summary())
+        report('peak memory: ' + str(round(peak / 2**20, 1)) + ' MB (estimate '
+               + str(round(estimate_memory(args.t,args.k,args.v,args.variant) / 2**20, 1)) + ' MB)')
+    return 0
+
+
+"""
+verify subcommand, prints the result as JSON and exits with status 1 when the array is not a covering array.
+t and v default to the ones stored with the array, k to its number of columns
+"""
+def verify(args):
+    ca, t, v = read_array(args.input,args.format)
+    t = args.t if args.t is not None else t
+    v = args.v if args.v is not None else v
+    if t is None or v is None:
+        raise ValueError('-t and -v are needed for arrays that do not store them')
+    k = args.k if args.k is not None else ca.shape[1]
+    start = time.perf_counter()
+    result = is_covering_array(ca,t,k,v)
+    elapsed = time.perf_counter() - start
+    print(json.dumps({'covered': result.covered, 'missing': result.num_missing, 'rows': len(ca), 't': t, 'k': k}))
+    report('verify: ' + str(len(ca)) + ' rows in ' + str(round(elapsed, 3)) + ' s')
+    return 0 if result.covered else 1
+
+
+"""
+bench subcommand, prints one JSON line of size statistics per variant as soon as its trials are done, with the peak
+memory in bytes of one run (the one of the root seed, in-process under tracemalloc) to size the workers by
+"""
+def bench(args):
+    for variant in args.variants:
+        _, peak = measure_peak_memory(ipo,args.t,args.k,args.v,variant,args.strategy,args.beam_width,args.seed)
+        start = time.perf_counter()
+        stats = run_trials(args.trials,args.t,args.k,args.v,variant,args.strategy,args.beam_width,args.workers,
+                           args.seed,args.ci_tol)
+        elapsed = time.perf_counter() - start
+        print(json.dumps({'t': args.t, 'k': args.k, 'v': args.v, 'variant': variant, 'strategy': args.strategy,
+                          'trials': stats.n, 'min': stats.min(), 'mean': stats.mean, 'std': stats.std(),
+                          'p50': stats.percentile(50), 'p95': stats.percentile(95), 'max': stats.max(),
+                          'peak_bytes': peak, 'seconds': elapsed}), flush=True)
+        report('bench: variant ' + str(variant) + ', ' + str(stats.n) + ' trials in ' + str(round(elapsed, 3)) + ' s')
+    return 0
+
+
+"""
+suite subcommand, runs the benchmark suite, writes it to --output and prints its progress and a line per configuration
+to stderr.
+Prints the regressions against --baseline as JSON lines and exits with status 1 if there are any
+"""
+def suite(args):
+    start = time.perf_counter()
+    results = run_suite(SUITE_GRID,args.variants,args.strategies,args.repeats,verbose=True)
+    save_suite(results,args.output)
+    print_suite(results,file=sys.stderr)
+    report('suite: ' + str(len(results['runs'])) + ' runs in ' + str(round(time.perf_counter() - start, 3)) + ' s')
+    if args.baseline is None:
+        return 0
+    regressions = compare_suite(results,load_suite(args.baseline))
+    for r in regressions:
+        print(json.dumps(r._asdict()))
+    return 1 if regressions else 0
+
+
+"""
+Argument parser of the subcommands
+"""
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m ipo', description='IPO covering array generator')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    def add_array_arguments(sub, required):
+        sub.add_argument('-t', type=int, required=required, help='strength')
+        sub.add_argument('-k', type=int, required=required, help='number of parameters')
+        sub.add_argument('-v', type=parse_sizes, required=required, help='alphabet size, or one per parameter as 3,3,2')
+
+    def add_engine_arguments(sub):
+        sub.add_argument('--strategy', choices=sorted(SEARCH_STRATEGIES), default='exhaustive', help='candidate search')
+        sub.add_argument('--beam-width', type=int, default=8, help="beam width of the beam search, and candidates kept for rows with don't care values, at least 1")
+
+    sub = commands.add_parser('generate', help='generate a covering array')
+    add_array_arguments(sub, True)
+    add_engine_arguments(sub)
+    sub.add_argument('--variant', type=int, default=1, help='IPO variant, the number of columns added per step')
+    sub.add_argument('--seed', type=int, default=None, help='seed, the same seed gives the same array')
+    sub.add_argument('--fill', choices=('random', 'greedy'), default='random', help="don't care filling")
+    sub.add_argument('--compact', action='store_true', help='drop redundant rows')
+    sub.add_argument('--anneal', type=float, default=0, metavar='SECONDS', help='anneal the array to fewer rows for this long')
+    sub.add_argument('--order', action='store_true', help='order rows most new interactions first')
+    sub.add_argument('--profile', action='store_true', help='print the time of each growth phase per step and the peak memory to stderr')
+    sub.add_argument('--format', choices=FORMATS, default=None, help='output format, from the extension by default')
+    sub.add_argument('-o', '--output', default='-', help='output file, stdout by default')
+    sub.set_defaults(run=generate)
+
+    sub = commands.add_parser('verify', help='check that an array is a covering array, exit status 1 if not')
+    sub.add_argument('input', help="array file, '-' for stdin")
+    add_array_arguments(sub, False)
+    sub.add_argument('--format', choices=FORMATS, default=None, help='input format, from the extension by default')
+    sub.set_defaults(run=verify)
+
+    sub = commands.add_parser('bench', help='array size statistics of IPO variants over seeded trials')
+    add_array_arguments(sub, True)
+    add_engine_arguments(sub)
+    sub.add_argument('--variants', type=parse_ints, default=[1], help='variants as 1,2,3')
+    sub.add_argument('--trials', type=int, default=100, help='number of trials per variant')
+    sub.add_argument('--workers', type=int, default=None, help='worker processes, defaults to the number of cores')
+    sub.add_argument('--seed', type=int, default=0, help='root seed of the trials')
+    sub.add_argument('--ci-tol', type=float, default=None, help='stop once the 95%% CI on the mean is within +/- this many rows')
+    sub.set_defaults(run=bench)
+
+    sub = commands.add_parser('suite', help='benchmark suite of array size, time and memory, compared with a baseline')
+    sub.add_argument('--variants', type=parse_ints, default=SUITE_VARIANTS, help='variants as 1,2,3')
+    sub.add_argument('--strategies', type=parse_names, default=tuple(SEARCH_STRATEGIES), help='strategies as exhaustive,beam')
+    sub.add_argument('--repeats', type=int, default=3, help='seeded runs per configuration')
+    sub.add_argument('-o', '--output', default='bench_output.json', help='JSON file the runs are written to')
+    sub.add_argument('--baseline', default=None, help='suite JSON to compare with')
+    sub.set_defaults(run=suite)
+    return parser
+
+
+"""
+Entry point of python -m ipo, returns the exit status: 0 on success, 1 when verify finds missing interactions
+and 2 on bad arguments or unreadable files
+"""
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        return args.run(args)
+    except (ValueError, OSError) as e:
+        report('ipo ' + args.command + ': ' + str(e))
+        return 2
@@ -0,0 +1,256 @@
+import numpy as np
+from itertools import product
+from .coverage import DC, radix_weights
+
+"""
+Constraints
+Forbidden value combinations of a configuration space, indexed for the growth steps and the verifier
+"""
+
+#most values Constraints.complete tries before it gives up on a row
+SEARCH_LIMIT = 1 << 12
+
+
+"""
+Constraints on the values of a configuration space
+v holds the alphabet size of every column and spec is a list of constraints, each one either
+  a forbidden tuple, as a dict {column: value} or a sequence of (column, value) pairs, or
+  a predicate, as a pair (columns, function) where function(*values) returns True when the values of those columns
+  are allowed together.
+Predicates are expanded to forbidden tuples up front, and forbidden tuples are indexed by their set of columns
+as a bool table over the mixed-radix codes of their values, so checking a batch of rows is one table lookup per
+set of columns and no Python predicate runs during growth.
+Rows are checked with DC meaning not decided yet, a forbidden tuple only applies once all of its cells have values.
+A row with no forbidden tuple may still be impossible to finish, complete searches for a valid full row holding it.
+"""
+class Constraints:
+
+    def __init__(self,v,spec=()):
+        self.sizes = np.asarray(v, dtype=np.intp)
+        #columns -> set of forbidden value tuples
+        self.forbidden = {}
+        for entry in spec:
+            if not isinstance(entry, dict) and len(entry) == 2 and callable(entry[1]):
+                cols = [int(c) for c in entry[0]]
+                for vals in product(*[range(self.sizes[c]) for c in cols]):
+                    if not entry[1](*vals):
+                        self.forbid(zip(cols, vals))
+            else:
+                self.forbid(entry.items() if isinstance(entry, dict) else entry)
+
+        self.tables = []
+        for cols, tuples in self.forbidden.items():
+            cols = np.array(cols, dtype=np.intp)
+            radix = self.sizes[cols]
+            weights = radix_weights(radix)
+            table = np.zeros(int(radix.prod()), dtype=bool)
+            table[np.array(sorted(tuples), dtype=np.intp) @ weights] = True
+            self.tables.append((cols, weights, table))
+
+        #links[c][x] holds, for every forbidden tuple with value x in column c, its other cells as (column, value) pairs
+        self.links = [[[] for _ in range(size)] for size in self.sizes]
+        for cols, tuples in self.forbidden.items():
+            for vals in tuples:
+                pairs = tuple(zip(cols, vals))
+                for i, (c, x) in enumerate(pairs):
+                    self.links[c][x].append(pairs[:i] + pairs[i+1:])
+        #columns some forbidden tuple involves, the only ones complete has to search
+        self.linked = [c for c in range(len(self.sizes)) if any(self.links[c])]
+
+    def forbid(self,pairs):
+        pairs = sorted((int(c), int(x)) for c, x in pairs)
+        for c, x in pairs:
+            if not 0 <= c < len(self.sizes) or not 0 <= x < self.sizes[c]:
+                raise ValueError('value ' + str(x) + ' out of range for column ' + str(c))
+        self.forbidden.setdefault(tuple(c for c, _ in pairs), set()).add(tuple(x for _, x in pairs))
+
+    #True if the cells of the dict {column: value} contain a forbidden tuple
+    def is_forbidden(self,cells):
+        for cols, tuples in self.forbidden.items():
+            if all(c in cells for c in cols) and tuple(cells[c] for c in cols) in tuples:
+                return True
+        return False
+
+    """
+    Completes a row into a full row of len(sizes) values that violates no forbidden tuple, or returns None if there is
+    none. row holds the first columns, DC in the cells left free, the columns past its length are free as well.
+    Backtracking over the free columns some forbidden tuple involves, the one with the fewest values left first, with
+    forward checking: each assignment removes from the free columns the values that would complete a forbidden tuple.
+    Free values are tried in random order with a numpy Generator rng, in increasing order otherwise, and columns no
+    tuple involves get a random value (0 without rng). The search gives up after limit values, returning None, which
+    only happens for constraints far tighter than the forbidden tuples between parameters tests usually have.
+    """
+    def complete(self,row,rng=None,limit=SEARCH_LIMIT):
+        value = [DC] * len(self.sizes)
+        value[:len(row)] = [int(x) for x in row]
+        blocked = [[0] * int(size) for size in self.sizes]
+        free = [int(size) for size in self.sizes]
+        trail = []
+
+        #blocks value x of column c, False when that leaves c no value
+        def block(c,x):
+            if blocked[c][x] == 0:
+                free[c] -= 1
+            blocked[c][x] += 1
+            trail.append((c, x))
+            return free[c] > 0
+
+        def undo(mark):
+            while len(trail) > mark:
+                c, x = trail.pop()
+                blocked[c][x] -= 1
+                if blocked[c][x] == 0:
+                    free[c] += 1
+
+        #sets column c to x and blocks the last free cell of the tuples it leaves one cell short, False on a dead end
+        def assign(c,x):
+            value[c] = x
+            for rest in self.links[c][x]:
+                last = None
+                for d, y in rest:
+                    if value[d] == DC:
+                        if last is not None:
+                            break
+                        last = (d, y)
+                    elif value[d] != y:
+                        break
+                else:
+                    if last is None or not block(*last):
+                        return False
+            return True
+
+        #forbidden single values
+        for c in self.linked:
+            for x in range(self.sizes[c]):
+                if () in self.links[c][x] and not block(c,x):
+                    return None
+        given = [c for c in range(len(row)) if value[c] != DC]
+        for c in given:
+            x = value[c]
+            value[c] = DC
+            if blocked[c][x] or not assign(c,x):
+                return None
+
+        def pick():
+            open_cols = [c for c in self.linked if value[c] == DC]
+            return min(open_cols, key=lambda c: free[c]) if open_cols else None
+
+        def options(c):
+            values = [x for x in range(self.sizes[c]) if not blocked[c][x]]
+            if rng is not None:
+                rng.shuffle(values)
+            return values
+
+        c = pick()
+        frames = [] if c is None else [[c, options(c), 0, len(trail)]]
+        tried = 0
+        while frames:
+            frame = frames[-1]
+            c, values, i, mark = frame
+            #take back the value tried last in this column
+            undo(mark)
+            value[c] = DC
+            if i == len(values):
+                frames.pop()
+                if not frames:
+                    return None
+                continue
+            frame[2] = i + 1
+            tried += 1
+            if tried > limit:
+                return None
+            if not assign(c,values[i]):
+                continue
+            c = pick()
+            if c is None:
+                break
+            frames.append([c, options(c), 0, len(trail)])
+
+        for c in range(len(value)):
+            if value[c] == DC:
+                value[c] = 0 if rng is None else int(rng.integers(self.sizes[c]))
+        return np.array(value, dtype=np.intp)
+
+    #True if some valid full row has the given values in the given columns
+    def can_hold(self,cols,vals):
+        row = np.full(len(self.sizes), DC, dtype=np.intp)
+        row[list(cols)] = vals
+        return self.complete(row) is not None
+
+    #marks the interactions of candidates (a bool array over the codes of the combinations cols, with radices radix and
+    #weights weights) that no valid row can hold, checking only the ones marked
+    def unreachable_mask(self,cols,radix,weights,candidates):
+        mask = np.zeros_like(candidates)
+        for j, code in zip(*np.nonzero(candidates)):
+            if not self.can_hold(cols[j], code // weights[j] % radix[j]):
+                mask[j, code] = True
+        return mask
+
+    def __len__(self):
+        return sum(len(tuples) for tuples in self.forbidden.values())
+
+    #the same constraints for the columns reordered so that column j is the old column order[j]
+    def reorder(self,order):
+        position = np.argsort(order)
+        spec = [list(zip(position[list(cols)], vals)) for cols, tuples in self.forbidden.items() for vals in tuples]
+        return Constraints(self.sizes[order], spec)
+
+    #True for each row that has all the cells of some forbidden tuple set to its values
+    def violates(self,rows):
+        rows = np.atleast_2d(rows)
+        bad = np.zeros(len(rows), dtype=bool)
+        for cols, weights, table in self.tables:
+            if cols.max() >= rows.shape[1]:
+                continue
+            vals = rows[:, cols]
+            ok = (vals != DC).all(axis=1)
+            bad |= ok & table[np.where(ok, (vals * weights).sum(axis=1), 0)]
+        return bad
+
+    #True for each candidate vals of the new columns that, appended to the first num_cols cells of row, violates a
+    #forbidden tuple involving a new column
+    def candidate_violations(self,row,vals,num_cols):
+        width = num_cols + vals.shape[1]
+        bad = np.zeros(len(vals), dtype=bool)
+        for cols, weights, table in self.tables:
+            if cols.max() >= width or cols.max() < num_cols:
+                continue
+            is_new = cols >= num_cols
+            old = row[cols[~is_new]]
+            if (old == DC).any():
+                continue
+            code = int(old @ weights[~is_new]) + vals[:, cols[is_new] - num_cols] @ weights[is_new]
+            bad |= table[code]
+        return bad
+
+    #True for every interaction of the given combinations (columns, radices and weights per row, codes up to size)
+    #that contains a forbidden tuple, forbidden tuples with more than t columns are not considered
+    def forbidden_mask(self,cols,radix,weights,size):
+        mask = np.zeros((len(cols), size), dtype=bool)
+        codes = np.arange(size)
+        for tcols, tweights, table in self.tables:
+            if len(tcols) > cols.shape[1]:
+                continue
+            #combinations that contain every column of the forbidden tuple, and where
+            holds = (cols[:, :, None] == tcols).any(axis=1).all(axis=1)
+            if not holds.any():
+                continue
+            pos = (cols[holds][:, :, None] == tcols).argmax(axis=1)
+            digits = codes[None, :, None] // weights[holds][:, None, :] % radix[holds][:, None, :]
+            proj = np.take_along_axis(digits, pos[:, None, :], axis=2)
+            mask[holds] |= table[(proj * tweights).sum(axis=2)]
+        return mask
+
+    #marks the forbidden interactions of a CoverageState as covered, they never have to appear in a row
+    def exclude(self,t_comb):
+        if len(t_comb) > 0:
+            t_comb.uncovered &= ~self.forbidden_mask(t_comb.cols,t_comb.radix,t_comb.weights,t_comb.uncovered.shape[1])
+
+
+"""
+Returns constraints as a Constraints object, building it from a list of constraints for the alphabet sizes v when needed
+"""
+def as_constraints(v,constraints):
+    if constraints is None or isinstance(constraints, Constraints):
+        return constraints
+    return Constraints(v,constraints)
@@ -0,0 +1,99 @@
+import numpy as np
+from itertools import combinations
+from itertools import chain
+from itertools import islice
+
+"""
+Coverage tracking
+Alphabet sizes, the mixed-radix encoding of t-way interactions and the coverage state IPO grows against,
+shared by the engine, the verifier and the post-processing passes
+"""
+
+"""
+Alphabet size of each of the first k columns
+v is either one alphabet size shared by every column or a sequence with one size per column
+"""
+def column_sizes(v,k):
+    if isinstance(v, (int, np.integer)):
+        return np.full(k, v, dtype=np.intp)
+    sizes = np.asarray(v, dtype=np.intp)
+    if len(sizes) < k:
+        raise ValueError('expected ' + str(k) + ' alphabet sizes, got ' + str(len(sizes)))
+    return sizes[:k]
+
+
+"""
+Mixed-radix weights for tuples of digits with the given radices (last axis), the first digit is the most significant
+"""
+def radix_weights(radix):
+    weights = np.ones_like(radix)
+    weights[..., :-1] = np.cumprod(radix[..., :0:-1], axis=-1)[..., ::-1]
+    return weights
+
+
+#don't care value, the '-' of the IPOG paper
+DC = -1
+
+
+"""
+Coverage state of the t-way interactions for a set of column combinations
+Each t-tuple of values is encoded as a mixed-radix integer, the radices being the alphabet sizes of the combination's
+columns (the same order as product over their ranges), and every column combination keeps one row of a NumPy bool array,
+where True means the interaction is still uncovered. Rows are padded to the largest combination, the padding is never uncovered.
+Covering a row and counting uncovered interactions are vectorized.
+v is one alphabet size for every column or a sequence of per-column sizes.
+comb is a list of column tuples or a 2-D array of them (see new_combinations).
+"""
+class CoverageState:
+
+    def __init__(self,t,v,comb):
+        self.t = t
+        #column positions of every combination, one row per combination
+        self.cols = np.array(comb, dtype=np.intp).reshape(-1, t)
+        self.radix = column_sizes(v, int(self.cols.max()) + 1 if len(self.cols) else 0)[self.cols]
+        #radix weights, the first position of the tuple is the most significant digit
+        self.weights = radix_weights(self.radix)
+        self.sizes = self.radix.prod(axis=1)
+        self.uncovered = np.arange(self.sizes.max() if len(self.cols) else 0) < self.sizes[:, None]
+
+    def __len__(self):
+        return len(self.cols)
+
+    #encoded interaction of a full row for every combination
+    def row_index(self,row):
+        return (np.asarray(row, dtype=np.intp)[self.cols] * self.weights).sum(axis=1)
+
+    #combinations through a DC cell of the row are left as they are
+    def cover_row(self,row):
+        row = np.asarray(row, dtype=np.intp)
+        valid = (row[self.cols] != DC).all(axis=1)
+        self.uncovered[np.nonzero(valid)[0], self.row_index(np.where(row == DC, 0, row))[valid]] = False
+
+    def count_uncovered(self):
+        return int(self.uncovered.sum())
+
+    #yields (key, vals) for every uncovered interaction, ordered by combination then by value
+    def uncovered_interactions(self):
+        rows, idxs = np.nonzero(self.uncovered)
+        for r, idx in zip(rows.tolist(), idxs.tolist()):
+            yield tuple(self.cols[r].tolist()), [idx // int(w) % int(x) for w, x in zip(self.weights[r], self.radix[r])]
+
+
+"""
+Generator over the t-way combinations of the columns 0 to n-1, in lexicographic order,
+as integer arrays of at most chunk_size combinations, one combination per row
+"""
+def comb_chunks(n,t,chunk_size):
+    combs = combinations(range(n), t)
+    while True:
+        chunk = np.fromiter(chain.from_iterable(islice(combs,chunk_size)), dtype=np.intp)
+        if len(chunk) == 0:
+            return
+        yield chunk.reshape(-1, t)
+
+
+"""
+Number of interactions of the largest t-way combination, the product of the t largest alphabet sizes
+"""
+def max_interactions(sizes,t):
+    return int(np.sort(sizes)[::-1][:t].prod())
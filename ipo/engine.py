@@ -0,0 +1,745 @@
+import numpy as np
+from itertools import combinations
+from itertools import product
+from itertools import chain
+from itertools import islice
+import math
+import time
+from .coverage import DC, column_sizes, CoverageState, comb_chunks
+from .constraints import as_constraints
+from .postprocess import fill_dc, reduce_rows, stream_rows
+
+"""
+IPO Algorithm
+This is an implementation of the IPOG algorithm as introduced in IPOG: A General Strategy for T-Way Software Testing (Lei1 et al).
+
+The basic idea of the IPOG algorithm is to use a covering array of size of k-1 parameters to build an array of k parameters.
+This growth is achieved in two steps, horizontal growth followed by vertical growth. The horizontal growth adds a new column to the covering array and chooses the value in each row of this new column strategically, maximizing uncovered interactions. If there are interactions that remain uncovered by horizontal growth, we must add new rows to the covering array. Vertical
+growth adds these uncovered interactions in the form of new rows.
+
+The function IPO takes three parameters: t, k, and v and returns a covering array
+
+t = the strength of the covering array
+
+k = the number of columns/parameters in the covering array
+
+v = the range of values a parameter can have, or a list with the range of each parameter for mixed alphabets
+
+In IPOG, we begin by initializing a t-way covering array with t parameters and v values. This is the initial covering array that we will augment.
+
+Next, we loop through the parameters t+1 to k, since we already have a CA that includes parameters 1 to t.
+
+We then create the set of t-way combinations of values involving parameter Pi and the previous i – 1 parameters, called t_comb.
+horizontal_growth
+We implement horizontal growth using a greedy method that chooses the value of the new parameter such that the chosen value maximizes the number of uncovered interactions.
+
+Horizontal growth begins by iterating through each row in order. v candidate rows are created. These rows are then tested to see which one covers the most uncovered interactions in t_comb. After the best candidate row is chosen, we remove the interactions it covers from t_comb, and augment the existing row in the covering array.
+
+Vertical Growth
+
+If there are any uncovered interactions left in t_comb, vertical growth is required. Vertical growth is accomplished by considering each uncovered interaction in t_comb. If there is no row that covers this interaction nor has a '-' in each place, a new row is created with the parameters having their respective values and '-' or don't cares in all other positions. If there is a row that has a '-' or the respective value for each parameter, modify this row such that each parameter has it's respective value as specified in t_comb.
+
+After Vertical Growth, there may be '-' positions that have not been filled. The '-' are filled randomly.
+
+The algorithm continues untill it creates a new column and however many rows for each parameter k.
+"""
+
+#score given to candidates that violate a constraint, low enough to stay below any sum of gains
+FORBIDDEN = -(1 << 40)
+
+
+"""
+Lookup tables used by horizontal growth
+Only the combinations that include at least one new column are scored, the others are made of old columns
+and their coverage cannot change when a row is extended.
+For each of those combinations we keep the positions and radix weights of its old columns and of its new columns,
+the encoded interaction of a row is then its fixed old-column part plus the part given by the new values.
+Combinations are also grouped by the last new column they involve, so a column-at-a-time search can score
+a partial assignment as soon as all of a combination's new columns have values.
+While a row with don't care values is grown, valid marks the combinations whose old columns all have values in it,
+the others cannot be covered by that row.
+"""
+class GrowthTables:
+
+    def __init__(self,t_comb,num_cols,num_rows):
+        self.sel = np.nonzero((t_comb.cols >= num_cols).any(axis=1))[0]
+        cols = t_comb.cols[self.sel]
+        is_new = cols >= num_cols
+        weights = t_comb.weights[self.sel]
+        self.old_cols = np.where(is_new, 0, cols)
+        self.old_w = np.where(is_new, 0, weights)
+        self.new_cols = np.where(is_new, cols - num_cols, 0)
+        self.new_w = np.where(is_new, weights, 0)
+        last_new = np.where(is_new, cols - num_cols, -1).max(axis=1)
+        self.groups = [np.nonzero(last_new == j)[0] for j in range(num_rows)]
+        self.everything = np.arange(len(self.sel))
+        #when every combination holds a new column (see new_combinations) the coverage is shared, not copied
+        self.uncovered = t_comb.uncovered if len(self.sel) == len(t_comb) else t_comb.uncovered[self.sel]
+        self.num_cols = num_cols
+        self.cols = cols
+        self.weights = weights
+        self.valid = None
+        self.by_column = {}
+        #constraints and the row being grown, candidates that violate them score FORBIDDEN
+        self.constraints = None
+        self.row = None
+        #values required in the new columns of the row being grown (DC where free), other candidates score FORBIDDEN
+        self.pins = None
+        #candidate values and their new-column parts, kept when they fit in a single chunk
+        self.cached = None
+        #number of (partial) candidates scored so far
+        self.scored = 0
+        #values of the new columns found impossible to complete for the row being grown, they score FORBIDDEN
+        self.rejected = None
+
+    #fixed projection of a row onto the old columns of every combination
+    def base(self,row):
+        return (row[self.old_cols] * self.old_w).sum(axis=1)
+
+    #encoded contribution of each candidate's new values, shape (candidates, combinations)
+    def new_part(self,vals,subset):
+        return (vals[:, self.new_cols[subset]] * self.new_w[subset]).sum(axis=2)
+
+    #combinations that have no don't care value among the old columns of the row
+    def valid_for(self,row):
+        return ~((row[self.old_cols] == DC) & (self.old_w > 0)).any(axis=1)
+
+    #number of uncovered interactions among the subset of combinations each candidate would cover
+    def gains(self,base,vals,subset,new_part=None):
+        self.scored += len(vals)
+        if new_part is None:
+            new_part = self.new_part(vals,subset)
+        covered = self.uncovered[subset, base[subset] + new_part]
+        if self.valid is not None:
+            covered = covered & self.valid[subset]
+        gains = covered.sum(axis=1)
+        if self.constraints is not None:
+            gains[self.constraints.candidate_violations(self.row,vals,self.num_cols)] = FORBIDDEN
+        if self.pins is not None:
+            pins = self.pins[:vals.shape[1]]
+            fixed = pins != DC
+            gains[(vals[:, fixed] != pins[fixed]).any(axis=1)] = FORBIDDEN
+        if self.rejected is not None and vals.shape[1] == self.rejected.shape[1]:
+            gains[(vals[:, None, :] == self.rejected).all(axis=2).any(axis=1)] = FORBIDDEN
+        return gains
+
+    def cover(self,base,vals):
+        idx = base + self.new_part(vals[None, :],self.everything)[0]
+        if self.valid is None:
+            self.uncovered[self.everything, idx] = False
+        else:
+            self.uncovered[self.everything[self.valid], idx[self.valid]] = False
+
+    #combinations that include column d
+    def with_column(self,d):
+        if d not in self.by_column:
+            self.by_column[d] = np.nonzero((self.cols == d).any(axis=1))[0]
+        return self.by_column[d]
+
+
+#number of candidates scored in one batch by the exhaustive search
+CANDIDATE_CHUNK = 4096
+
+
+#bound on candidates times combinations in one batch, keeps the scores of a batch within a few tens of MB
+CANDIDATE_CELLS = 1 << 22
+
+
+#combinations of old columns generated at a time by new_combinations
+COMB_CHUNK = 1 << 16
+
+
+"""
+Generator over every combination of values for the new columns, in lexicographic order and in chunks
+so that the candidates are never materialised all at once, v holds the alphabet sizes of the new columns
+"""
+def candidate_values(v,chunk_size=CANDIDATE_CHUNK):
+    values = product(*[range(size) for size in v])
+    while True:
+        chunk = np.fromiter(chain.from_iterable(islice(values,chunk_size)), dtype=np.intp)
+        if len(chunk) == 0:
+            return
+        yield chunk.reshape(-1, len(v))
+
+
+"""
+Index of the best score, ties go to the last one as in the original candidate loop
+"""
+def last_argmax(scores):
+    return len(scores) - 1 - int(np.argmax(scores[::-1]))
+
+
+"""
+Exhaustive search, scores every candidate and returns the values of the best one
+The search strategies take the alphabet sizes v of the num_rows new columns, the fixed old-column part of the row
+for every combination, the GrowthTables and the beam width
+"""
+def exhaustive_search(v,num_rows,base,tables,beam_width):
+    chunk_size = max(1, min(CANDIDATE_CHUNK, CANDIDATE_CELLS // max(len(tables.everything), 1)))
+    if tables.cached is None and math.prod(v) <= chunk_size:
+        vals = next(candidate_values(v))
+        tables.cached = [(vals, tables.new_part(vals,tables.everything))]
+    chunks = tables.cached if tables.cached is not None else ((vals, None) for vals in candidate_values(v,chunk_size))
+
+    best_vals = None
+    best_gain = -1
+    for vals, new_part in chunks:
+        gains = tables.gains(base,vals,tables.everything,new_part)
+        i = last_argmax(gains)
+        if best_vals is None or gains[i] >= best_gain:
+            best_gain = gains[i]
+            best_vals = vals[i]
+    return best_vals
+
+
+"""
+Beam search, assigns the new columns one at a time and keeps the beam_width best partial assignments
+A partial assignment is scored on the combinations whose new columns all have values, so its score is exact
+and a wide enough beam gives the same answer as the exhaustive search
+"""
+def beam_search(v,num_rows,base,tables,beam_width):
+    states = np.zeros((1,0), dtype=np.intp)
+    scores = np.zeros(1, dtype=np.intp)
+    for j in range(num_rows):
+        #extend every partial assignment with each value of the next new column
+        states = np.hstack((np.repeat(states, v[j], axis=0), np.tile(np.arange(v[j]), len(states))[:, None]))
+        scores = np.repeat(scores, v[j]) + tables.gains(base,states,tables.groups[j])
+        if len(states) > beam_width:
+            #best scores first, ties broken towards the later assignment, then restore lexicographic order
+            keep = np.sort(np.lexsort((-np.arange(len(scores)), -scores))[:beam_width])
+            states = states[keep]
+            scores = scores[keep]
+    return states[last_argmax(scores)]
+
+
+"""
+Greedy search, assigns the new columns one at a time keeping only the best value for each
+"""
+def greedy_search(v,num_rows,base,tables,beam_width):
+    return beam_search(v,num_rows,base,tables,1)
+
+
+SEARCH_STRATEGIES = {'exhaustive': exhaustive_search, 'greedy': greedy_search, 'beam': beam_search}
+
+
+"""
+Greedy don't care filling of a grown row
+Each don't care cell of the old columns gets the value that covers the most uncovered interactions together with
+the new columns. Cells where no value covers anything stay don't care, so vertical growth and the next growth steps
+can still use them. Returns the number of interactions covered this way.
+With constraints a cell only takes a value that leaves the row possible to complete (see Constraints.complete).
+With commit unset the row and the coverage are left untouched and only the gain is returned, cells are then
+scored independently of each other.
+"""
+def fill_row_greedy(sizes,row,tables,commit=True):
+    total = 0
+    dc_cells = np.nonzero(row[:tables.num_cols] == DC)[0]
+    for d in dc_cells:
+        combs = tables.with_column(d)
+        cols = tables.cols[combs]
+        weights = tables.weights[combs]
+        #the row's values on the combinations through d, for each value x of d, shape (sizes[d], combinations, t)
+        vals = np.where(cols == d, np.arange(sizes[d])[:, None, None], row[cols])
+        #don't care values elsewhere in the row give out of range codes, those combinations are masked out
+        ok = (vals != DC).all(axis=2)
+        gains = (tables.uncovered[combs, np.where(ok, (vals * weights).sum(axis=2), 0)] & ok).sum(axis=1)
+        if tables.constraints is not None:
+            options = np.tile(row, (sizes[d], 1))
+            options[:, d] = np.arange(sizes[d])
+            gains[tables.constraints.violates(options)] = FORBIDDEN
+        best = int(np.argmax(gains))
+        total += max(int(gains[best]), 0)
+        if not commit:
+            continue
+        #the best value that leaves the row possible to complete
+        for x in np.argsort(-gains, kind='stable'):
+            if gains[x] <= 0:
+                break
+            row[d] = x
+            if tables.constraints is None or tables.constraints.complete(row) is not None:
+                break
+            row[d] = DC
+        if row[d] != DC:
+            vals = row[cols]
+            ok = (vals != DC).all(axis=1)
+            tables.uncovered[combs[ok], (vals[ok] * weights[ok]).sum(axis=1)] = False
+    return total
+
+
+"""
+Candidate search for a row that still has don't care values
+The beam_width best candidates on the combinations without don't care cells (or the search strategy's choice when
+there are too many candidates to score them all) are rescored with the gain of greedily filling the don't care cells,
+so the new values are chosen together with the values the don't care cells will get
+"""
+def dc_search(sizes,num_rows,base,tables,beam_width,search,row):
+    v = sizes[len(row):]
+    if math.prod(v) <= CANDIDATE_CHUNK:
+        #scored in chunks of at most CANDIDATE_CELLS cells, keeping the beam_width best seen so far
+        chunk_size = max(1, min(CANDIDATE_CHUNK, CANDIDATE_CELLS // max(len(tables.everything), 1)))
+        vals = np.zeros((0, len(v)), dtype=np.intp)
+        gains = np.zeros(0, dtype=np.int64)
+        order = np.zeros(0, dtype=np.intp)
+        done = 0
+        for chunk in candidate_values(v,chunk_size):
+            vals = np.vstack((vals, chunk))
+            gains = np.concatenate((gains, tables.gains(base,chunk,tables.everything)))
+            order = np.concatenate((order, np.arange(done, done + len(chunk))))
+            done += len(chunk)
+            #best gains first, ties broken towards the later candidate, then back to candidate order
+            shortlist = np.sort(np.lexsort((-order, -gains))[:beam_width])
+            vals, gains, order = vals[shortlist], gains[shortlist], order[shortlist]
+    else:
+        vals = search(v,num_rows,base,tables,beam_width)[None, :]
+        gains = tables.gains(base,vals,tables.everything)
+
+    grown = np.empty(len(row) + num_rows, dtype=row.dtype)
+    grown[:len(row)] = row
+    totals = np.empty(len(vals), dtype=np.int64)
+    for i in range(len(vals)):
+        grown[len(row):] = vals[i]
+        totals[i] = gains[i] + fill_row_greedy(sizes,grown,tables,commit=False)
+    return vals[last_argmax(totals)]
+
+
+"""
+Horizontal Growth algorithm
+Takes the covering array as a 2-D integer array and returns it with num_rows new columns,
+candidate extensions of a row are scored in batches.
+strategy selects how the values of the new columns are searched: 'exhaustive' scores every candidate,
+'greedy' picks the new columns one at a time and 'beam' keeps the beam_width best partial rows.
+strategy can also be any function with the same signature as exhaustive_search.
+v is one alphabet size for every column or a sequence of per-column sizes.
+Candidates that violate the constraints (a Constraints object), or leave the row impossible to complete, are never chosen.
+preset holds values required in the new columns for the first len(preset) rows, DC where the value is free.
+The number of candidates scored is added to profile.candidates when a StepProfile is given
+"""
+def horizontal_growth(t,v,num_rows,ca,t_comb,strategy='exhaustive',beam_width=8,constraints=None,preset=None,profile=None):
+    if callable(strategy):
+        search = strategy
+    elif strategy in SEARCH_STRATEGIES:
+        search = SEARCH_STRATEGIES[strategy]
+    else:
+        raise ValueError('unknown search strategy ' + repr(strategy))
+
+    num_cols = ca.shape[1]
+    sizes = column_sizes(v, num_cols + num_rows)
+    new_sizes = [int(size) for size in sizes[num_cols:]]
+    tables = GrowthTables(t_comb,num_cols,num_rows)
+    tables.constraints = constraints
+    grown = np.empty((len(ca), num_cols + num_rows), dtype=np.intp)
+    grown[:, :num_cols] = ca
+    has_dc = (ca == DC).any(axis=1)
+
+    for r in range(len(ca)):
+        base = tables.base(ca[r])
+        tables.row = ca[r]
+        if preset is not None:
+            tables.pins = preset[r] if r < len(preset) and (preset[r] != DC).any() else None
+        if has_dc[r]:
+            #combinations through a don't care cell are left out of the scores
+            tables.valid = tables.valid_for(ca[r])
+            base = np.where(tables.valid, base, 0)
+
+        #find the values of the new columns that cover the most amount of interactions
+        tables.rejected = None
+        while True:
+            if has_dc[r]:
+                new_vals = dc_search(sizes,num_rows,base,tables,beam_width,search,ca[r])
+            else:
+                new_vals = search(new_sizes,num_rows,base,tables,beam_width)
+            if constraints is None:
+                break
+            if constraints.candidate_violations(ca[r],new_vals[None, :],num_cols)[0] or (
+                    tables.rejected is not None and (tables.rejected == new_vals).all(axis=1).any()):
+                raise ValueError('the constraints leave no valid values for the new columns of row ' + str(r))
+            #values that leave no way to complete the row are scored out and the search runs again
+            if constraints.complete(np.concatenate((ca[r], new_vals))) is not None:
+                break
+            tables.rejected = new_vals[None, :] if tables.rejected is None else np.vstack((tables.rejected, new_vals))
+        tables.rejected = None
+        if tables.pins is not None and ((tables.pins != DC) & (tables.pins != new_vals)).any():
+            raise ValueError('the required values of row ' + str(r) + ' violate the constraints')
+
+        #remove from t_comb the combinations of values covered by r'
+        tables.cover(base,new_vals)
+
+        #add augmented row to covering array
+        grown[r, num_cols:] = new_vals
+
+        if has_dc[r]:
+            tables.valid = None
+            fill_row_greedy(sizes,grown[r],tables)
+
+    #the array already covers every interaction made of old columns only
+    if tables.uncovered is not t_comb.uncovered:
+        t_comb.uncovered[:] = False
+        t_comb.uncovered[tables.sel] = tables.uncovered
+    if profile is not None:
+        profile.candidates += tables.scored
+    return grown
+
+
+"""
+Vertical Growth Algorithm
+Takes the uncovered interactions as input and returns the CA with new rows added if necessary.
+New rows hold DC in the positions no interaction has fixed yet. With reuse set, the rows of the CA that still have
+DC values are tried first, before any new row. With constraints, a row is only modified if it can still be
+completed into a valid row (see Constraints.complete), and interactions no valid row can hold are skipped.
+To find a row that has DC or the respective value in every position of an interaction, each column keeps
+a bitmask of the new rows that have fixed a value there and a bitmask per value of the rows holding it.
+The compatible rows are the intersection over the interaction's columns, the first of them is modified.
+"""
+def vertical_growth(t_comb, ca, reuse=False, constraints=None):
+    v_rows = []
+    row_len = ca.shape[1]
+    all_rows = 0
+    #fixed[pos] has a bit for each row whose position pos is not DC, match[(pos, v)] for each row whose position pos has value v
+    fixed = [0] * row_len
+    match = {}
+
+    #rows of the CA that still have DC values
+    reused = np.nonzero((ca == DC).any(axis=1))[0] if reuse else []
+    for r, ca_row in enumerate(reused):
+        v_rows.append(ca[ca_row].tolist())
+        bit = 1 << r
+        all_rows |= bit
+        for pos, v in enumerate(v_rows[r]):
+            if v != DC:
+                fixed[pos] |= bit
+                match[(pos, v)] = match.get((pos, v), 0) | bit
+
+    #for every uncovered interaction in t_comb
+    #for each pair (pk*w, pi*u) in t_comb, pk is the col position and w is the value
+    for key, val in t_comb.uncovered_interactions():
+        #rows of v_rows that have DC or the respective value in every position
+        compatible = all_rows
+        for pos, v in zip(key, val):
+            compatible &= match.get((pos, v), 0) | (all_rows & ~fixed[pos])
+            if not compatible:
+                break
+
+        while compatible and constraints is not None:
+            r = (compatible & -compatible).bit_length() - 1
+            test = np.array(v_rows[r])
+            test[list(key)] = val
+            if constraints.complete(test) is not None:
+                break
+            compatible &= ~(1 << r)
+
+        if not compatible and constraints is not None and not constraints.can_hold(key,val):
+            #no valid row holds the interaction, the forbidden tuples imply it is forbidden too
+            continue
+        if compatible:
+            #modify the first compatible row
+            r = (compatible & -compatible).bit_length() - 1
+            vrow = v_rows[r]
+        else:
+            #else add a new row to v_rows that has w as value for pk, u as value for pi, and DC for all other parameters
+            r = len(v_rows)
+            vrow = [DC] * row_len
+            v_rows.append(vrow)
+            all_rows |= 1 << r
+
+        bit = 1 << r
+        for pos, v in zip(key, val):
+            if vrow[pos] == DC:
+                vrow[pos] = v
+                fixed[pos] |= bit
+                match[(pos, v)] = match.get((pos, v), 0) | bit
+
+    #write back the reused rows and add new rows to covering array
+    for r, ca_row in enumerate(reused):
+        ca[ca_row] = v_rows[r]
+    if len(v_rows) == len(reused):
+        return ca
+    return np.vstack((ca, np.array(v_rows[len(reused):], dtype=ca.dtype)))
+
+
+"""
+Stride schedule of the IPO engine
+Yields (i, num_rows) for every growth step, where i is the first new column and num_rows the number of columns added.
+stride is either a fixed number of columns, a sequence of strides used in order (the last one repeats),
+or a function stride(i,k) returning the stride for the step starting at column i.
+Growth starts at column start, column t by default.
+The last step is shortened so that the array ends with exactly k columns.
+"""
+def stride_steps(t,k,stride,start=None):
+    i = t if start is None else start
+    step = 0
+    while i < k:
+        if callable(stride):
+            s = stride(i,k)
+        elif isinstance(stride, (int, np.integer)):
+            s = stride
+        else:
+            s = stride[min(step, len(stride)-1)]
+        if s < 1:
+            raise ValueError('stride must be at least 1, got ' + str(s))
+        num_rows = min(int(s), k-i)
+        yield i, num_rows
+        i += num_rows
+        step += 1
+
+
+"""
+Adaptive stride schedule, wide strides for the first columns tapering linearly to narrow ones for the last columns
+Returns a function that can be passed as the stride of ipo
+"""
+def tapered_stride(wide,narrow):
+    def stride(i,k):
+        return max(1, round(wide + (narrow - wide) * i / max(k-1, 1)))
+    return stride
+
+
+"""
+Column combinations of strength t over the first i+num_rows columns that hold at least one of the new columns
+i to i+num_rows-1, as a 2-D array in lexicographic order. They are built from chunks of combinations of the old
+columns joined with the combinations of the new ones, as arrays rather than tuples, and the combinations of old
+columns only, by far the most at high t and k, are never generated.
+"""
+def new_combinations(t,i,num_rows):
+    parts = [np.empty((0, t), dtype=np.intp)]
+    for s in range(max(1, t-i), min(t, num_rows) + 1):
+        new_part = np.array(list(combinations(range(i, i+num_rows), s)), dtype=np.intp)
+        old_parts = comb_chunks(i,t-s,COMB_CHUNK) if t > s else [np.empty((1, 0), dtype=np.intp)]
+        for old_part in old_parts:
+            parts.append(np.hstack((np.repeat(old_part, len(new_part), axis=0), np.tile(new_part, (len(old_part), 1)))))
+    cols = np.concatenate(parts)
+    return cols[np.lexsort(cols.T[::-1])]
+
+
+"""
+Growth loop shared by ipo and extend
+Grows the covering array ca of strength t from its current number of columns to k, column sizes v, stride columns
+per step, and fills the don't care values left at the end. preset holds values required in the new columns for the
+first len(preset) rows of ca (DC where free) and is indexed by column like the finished array.
+profile is an optional GrowthProfile each step is recorded in.
+"""
+def grow(t,v,ca,k,stride,strategy,beam_width,rng,fill='random',constraints=None,preset=None,profile=None):
+    if fill not in ('random', 'greedy'):
+        raise ValueError('unknown fill mode ' + repr(fill))
+    if beam_width < 1:
+        raise ValueError('beam_width must be at least 1')
+
+    #loop through parameters t+1 to k, num_rows at a time
+    for i, num_rows in stride_steps(t,k,stride,ca.shape[1]):
+        step = None if profile is None else profile.start_step(i,num_rows,len(ca))
+
+        #let t_comb be the set of t-way combinations of values involving parameters Pi to Pi+num_rows-1 and the previous parameters,
+        #the combinations of previous parameters only are covered already and are left out
+        t_comb = CoverageState(t,v,new_combinations(t,i,num_rows))
+        if constraints is not None:
+            constraints.exclude(t_comb)
+        if step is not None:
+            step.interactions = t_comb.count_uncovered()
+            step.lap('combinations')
+
+        #horizontal growth
+        pins = None if preset is None else preset[:, i:i+num_rows]
+        ca = horizontal_growth(t,v,num_rows,ca,t_comb,strategy,beam_width,constraints,pins,step)
+
+        remaining = t_comb.count_uncovered()
+        if step is not None:
+            step.covered_horizontally = step.interactions - remaining
+            step.covered_vertically = remaining
+            step.lap('horizontal')
+        if remaining > 0:
+            #vertical growth
+            ca = vertical_growth(t_comb, ca, reuse=(fill == 'greedy'), constraints=constraints)
+            if step is not None:
+                step.lap('vertical')
+            #fill '-' values
+            if fill == 'random':
+                fill_dc(v, ca, rng, constraints)
+                if step is not None:
+                    step.lap('fill')
+        if step is not None:
+            profile.end_step(step,len(ca))
+
+    #fill the '-' values greedy filling left
+    start = None if profile is None else time.perf_counter()
+    fill_dc(v, ca, rng, constraints)
+    if profile is not None:
+        profile.record('final_fill',start)
+    return ca
+
+
+"""
+IPO engine
+Input strength of covering array t, number of parameters k, number of values v and the stride schedule
+Implements the IPOG algorithm adding stride columns per growth step (see stride_steps), and returns a covering array of size N
+as a 2-D integer array.
+v is either one alphabet size for all parameters or a list with the alphabet size of each parameter. As IPOG recommends,
+the parameters are grown in non-increasing order of alphabet size and the columns are put back in the given order at the end.
+strategy is the candidate search used by horizontal growth, either the name of one of SEARCH_STRATEGIES
+or a function with the same signature as exhaustive_search.
+seed is anything numpy.random.default_rng accepts (None, an int, a SeedSequence or a Generator),
+the same seed always gives the same array.
+With compact set the finished array goes through reduce_rows, which drops the rows that have become redundant.
+fill chooses how don't care values are filled: 'random' fills them after each vertical growth, 'greedy' keeps them
+through later steps, giving them values in horizontal growth only where that covers new interactions
+and letting vertical growth reuse them, the ones left at the end are filled randomly.
+constraints is a list of forbidden tuples and predicates over the parameters (see Constraints). No row of the result
+violates them, and the interactions no valid row can hold (the forbidden ones and the ones they imply) are left out
+of the coverage. Every row is kept possible to complete (see Constraints.complete), a ValueError is raised if the
+constraints leave no valid row.
+profile is an optional GrowthProfile that records the time, candidates and coverage of each growth step.
+"""
+def ipo(t,k,v,stride=1,strategy='exhaustive',beam_width=8,seed=None,compact=False,fill='random',constraints=None,
+        profile=None):
+    start = None if profile is None else time.perf_counter()
+    rng = np.random.default_rng(seed)
+    sizes = column_sizes(v,k)
+    #largest alphabets first, order[j] is the parameter grown as column j
+    order = np.argsort(-sizes, kind='stable')
+    v = sizes[order]
+    constraints = as_constraints(sizes,constraints)
+    if constraints is not None:
+        constraints = constraints.reorder(order)
+
+    #initial CA, add a row for each combination of values of the first t parameters ie. exhaustive search method
+    ca = np.array(list(product(*[range(size) for size in v[:t]])), dtype=np.intp)
+    ca = ca[rng.permutation(len(ca))]
+    if constraints is not None:
+        #rows that cannot be completed would leave horizontal growth no valid values
+        ca = ca[[constraints.complete(row) is not None for row in ca]]
+        if len(ca) == 0:
+            raise ValueError('the constraints leave no valid row')
+    if profile is not None:
+        profile.record('initial',start)
+
+    ca = grow(t,v,ca,k,stride,strategy,beam_width,rng,fill,constraints,profile=profile)
+
+    if compact:
+        start = None if profile is None else time.perf_counter()
+        ca = reduce_rows(ca,t,v,seed=rng,constraints=constraints)
+        if profile is not None:
+            profile.record('compact',start)
+
+    #back to the given parameter order
+    return ca[:, np.argsort(order)]
+
+
+"""
+Extends an existing covering array of strength t with new parameters, the same growth ipo does from its first t columns
+ca holds the rows for the first parameters, k is the new number of parameters and v one alphabet size or the
+sizes of all k parameters. required is an optional list of rows of length k that must appear in the result, with DC
+(-1) in the cells left free. The rows of ca come first, unchanged, followed by the required rows with their free cells
+filled, then the rows vertical growth adds. Interactions ca or the required rows miss among the first parameters are
+covered by new rows before any column is added.
+Parameters keep their order. stride, strategy, beam_width, seed, fill and constraints are as in ipo, the constraints
+ranging over all k parameters, and ca and required rows must satisfy them. profile is as in ipo, the covering of
+the first parameters is recorded as its initial phase.
+"""
+def extend(ca,t,k,v,required=None,stride=1,strategy='exhaustive',beam_width=8,seed=None,fill='random',constraints=None,
+           profile=None):
+    start = None if profile is None else time.perf_counter()
+    rng = np.random.default_rng(seed)
+    sizes = column_sizes(v,k)
+    ca = np.array(ca, dtype=np.intp)
+    if ca.ndim != 2 or not t <= ca.shape[1] <= k:
+        raise ValueError('ca must be a 2-D array with between t and k columns')
+    k0 = ca.shape[1]
+    if ((ca < 0) | (ca >= sizes[:k0])).any():
+        raise ValueError('ca holds values out of range of the alphabet sizes')
+    constraints = as_constraints(sizes,constraints)
+
+    preset = np.full((len(ca), k), DC, dtype=np.intp)
+    preset[:, :k0] = ca
+    if required is not None and len(required) > 0:
+        required = np.array(required, dtype=np.intp)
+        if required.ndim != 2 or required.shape[1] != k:
+            raise ValueError('required rows must have k values')
+        if ((required < DC) | (required >= sizes)).any():
+            raise ValueError('required rows hold values out of range of the alphabet sizes')
+        preset = np.vstack((preset, required))
+    if constraints is not None and any(constraints.complete(row) is None for row in preset):
+        raise ValueError('the rows given violate the constraints')
+
+    #cover what the rows miss among the first k0 parameters, filling the free cells of the required rows first
+    ca = preset[:, :k0].copy()
+    t_comb = CoverageState(t,sizes,new_combinations(t,0,k0))
+    for row in ca:
+        t_comb.cover_row(row)
+    if constraints is not None:
+        constraints.exclude(t_comb)
+    if t_comb.count_uncovered() > 0:
+        ca = vertical_growth(t_comb, ca, reuse=True, constraints=constraints)
+    if fill == 'random':
+        fill_dc(sizes, ca, rng, constraints)
+
+    if profile is not None:
+        profile.record('initial',start)
+
+    return grow(t,sizes,ca,k,stride,strategy,beam_width,rng,fill,constraints,preset,profile)
+
+
+"""
+IPO Baseline
+Input strength of covering array t, number of parameters k, and number of values v
+IPO function implements the IPOG algorithm, and returns a covering array of size N
+"""
+def IPO(t,k,v,strategy='exhaustive',beam_width=8,seed=None):
+    return ipo(t,k,v,1,strategy,beam_width,seed).tolist()
+
+
+"""
+IPO 2
+"""
+def IPO_2(t,k,v,strategy='exhaustive',beam_width=8,seed=None):
+    return ipo(t,k,v,2,strategy,beam_width,seed).tolist()
+
+
+"""
+IPO 3
+"""
+def IPO_3(t,k,v,strategy='exhaustive',beam_width=8,seed=None):
+    return ipo(t,k,v,3,strategy,beam_width,seed).tolist()
+
+
+"""
+IPO 4
+"""
+def IPO_4(t,k,v,strategy='exhaustive',beam_width=8,seed=None):
+    return ipo(t,k,v,4,strategy,beam_width,seed).tolist()
+
+
+"""
+IPO 5
+"""
+def IPO_5(t,k,v,strategy='exhaustive',beam_width=8,seed=None):
+    return ipo(t,k,v,5,strategy,beam_width,seed).tolist()
+
+
+"""
+IPO 6
+"""
+def IPO_6(t,k,v,strategy='exhaustive',beam_width=8,seed=None):
+    return ipo(t,k,v,6,strategy,beam_width,seed).tolist()
+
+
+"""
+IPO 8
+"""
+def IPO_8(t,k,v,strategy='exhaustive',beam_width=8,seed=None):
+    return ipo(t,k,v,8,strategy,beam_width,seed).tolist()
+
+
+"""
+IPO 12
+"""
+def IPO_12(t,k,v,strategy='exhaustive',beam_width=8,seed=None):
+    return ipo(t,k,v,12,strategy,beam_width,seed).tolist()
+
+
+"""
+Streaming generation
+Builds a covering array with ipo (same arguments) and yields its rows as StreamedRow, most new interactions first
+(see stream_rows), so a test runner can start on the first rows while the rest are still being ordered.
+IPOG only settles the values of a row when the last column is grown, so the first row comes once growth is done.
+"""
+def ipo_stream(t,k,v,stride=1,strategy='exhaustive',beam_width=8,seed=None,compact=False,fill='random',constraints=None,
+               profile=None):
+    ca = ipo(t,k,v,stride,strategy,beam_width,seed,compact,fill,constraints,profile)
+    yield from stream_rows(ca,t,v,constraints)
@@ -0,0 +1,73 @@
+import matplotlib.pyplot as plt
+from .bench import best_of, run_trials
+
+"""
+Plots
+Array sizes of the IPO variants against the number of parameters, and coverage curves of row orders.
+This is the only module that needs matplotlib and the package does not import it, so the engine, the verifier
+and the benchmark workers start without paying for it.
+"""
+
+
+"""
+Name of a variant (a stride) as it appears in the paper
+"""
+def variant_name(variant):
+    return 'IPO' if variant == 1 else 'IPO ' + str(variant)
+
+
+"""
+Smallest N out of num_iter runs of each variant (a stride) for CA(t,k,v), k on the y axis
+"""
+def plot_best_sizes(t,ks,v,variants=(2,1),num_iter=10,workers=1):
+    plt.figure()
+    for variant in variants:
+        sizes = [len(best_of(num_iter,t,k,v,variant,workers=workers).ca) for k in ks]
+        print(variant_name(variant) + ' ' + str(sizes))
+        plt.plot(sizes, list(ks))
+    plt.title(' vs. '.join(variant_name(variant) for variant in variants) + ' for CA(' + str(t) + ',k,' + str(v) + ')')
+    plt.xlabel("N")
+    plt.ylabel("k")
+    plt.legend([variant_name(variant) for variant in variants])
+
+
+"""
+Average N over num_iter runs of each variant for CA(t,k,v), k on the y axis
+"""
+def plot_average_sizes(t,ks,v,variants=(1,2),num_iter=50,workers=None):
+    plt.figure()
+    for variant in variants:
+        sizes = [run_trials(num_iter,t,k,v,variant,workers=workers).mean for k in ks]
+        plt.plot(sizes, list(ks))
+    plt.title("Average N for CA(" + str(t) + ",k," + str(v) + ")")
+    plt.xlabel("N")
+    plt.ylabel("k")
+    plt.legend([variant_name(variant) for variant in variants])
+
+
+"""
+Fraction of the interactions covered against the number of leading rows, one line per curve (see coverage_curve)
+"""
+def plot_coverage_curves(curves,labels):
+    plt.figure()
+    for curve in curves:
+        plt.plot(range(1, len(curve) + 1), curve)
+    plt.title("Coverage of the first rows")
+    plt.xlabel("rows")
+    plt.ylabel("fraction of interactions covered")
+    plt.legend(labels)
+
+
+"""
+Figure 1 of the paper, IPO 2 against IPO for CA(3,k,3) and CA(2,k,5), best of 10 runs
+"""
+def figure_1():
+    plot_best_sizes(3,range(10,51,2),3)
+    plot_best_sizes(2,range(10,51,2),5)
+
+
+"""
+Figure 2 of the paper, average N of IPO and IPO 2 for CA(2,k,2) over 50 runs
+"""
+def figure_2():
+    plot_average_sizes(2,range(10,86,1),2)
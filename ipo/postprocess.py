@@ -0,0 +1,321 @@
+import numpy as np
+import math
+import time
+from collections import namedtuple
+from .coverage import DC, column_sizes, radix_weights, comb_chunks, max_interactions
+from .constraints import as_constraints
+from .verify import VERIFY_CHUNK, interaction_counts
+
+"""
+Post-processing
+Filling of don't care values, removal of redundant rows, annealing of finished arrays to fewer rows and their
+coverage-prioritized row order
+"""
+
+"""
+Function that fills don't care values after vertical growth
+Takes the covering array, values v (one size or per-column sizes) and a numpy Generator as input and randomly assigns
+the don't care positions a value, all of them drawn in one call.
+With constraints the don't care cells of a row get random values that keep the row possible to complete,
+the columns past the array's width included (see Constraints.complete)
+"""
+def fill_dc(v,ca,rng=None,constraints=None):
+    rng = np.random.default_rng(rng)
+    sizes = column_sizes(v, ca.shape[1])
+    rows, cols = np.nonzero(ca == DC)
+    if constraints is None or len(constraints) == 0:
+        ca[rows, cols] = rng.integers(0, sizes[cols])
+        return
+
+    for r in np.unique(rows):
+        row = constraints.complete(ca[r],rng)
+        if row is None:
+            raise ValueError('the constraints leave no valid values for the don\'t care cells of row ' + str(r))
+        ca[r] = row[:ca.shape[1]]
+
+
+"""
+Post-construction row reduction
+Drops the rows of a covering array whose interactions are all covered by other rows. Rows are tried from the last one
+(vertical growth rows come last and are the most likely to be redundant), and the multiplicity table is updated after
+each removal so the result is still a covering array.
+With passes > 0 the cells of each remaining row that take part in no uniquely covered interaction are re-randomized
+(those are the don't care cells of the finished array) and the removal sweep is repeated, which can free more rows.
+With constraints the re-randomized values keep every row valid.
+"""
+def reduce_rows(ca,t,v,passes=0,seed=None,constraints=None):
+    rng = np.random.default_rng(seed)
+    arr = np.array(ca, dtype=np.intp)
+    cols, weights, counts = interaction_counts(arr,t,v)
+    sizes = column_sizes(v,arr.shape[1])
+    constraints = as_constraints(sizes,constraints)
+    everything = np.arange(len(cols))
+    keep = np.ones(len(arr), dtype=bool)
+
+    for p in range(passes + 1):
+        if p > 0:
+            for r in np.nonzero(keep)[0]:
+                idx = (arr[r][cols] * weights).sum(axis=1)
+                counts[everything, idx] -= 1
+                #cells of the interactions only this row covers must keep their values
+                pinned = np.zeros(arr.shape[1], dtype=bool)
+                pinned[cols[counts[everything, idx] == 0].ravel()] = True
+                arr[r, ~pinned] = DC
+                fill_dc(sizes,arr[r:r+1],rng,constraints)
+                counts[everything, (arr[r][cols] * weights).sum(axis=1)] += 1
+
+        for r in reversed(range(len(arr))):
+            if not keep[r]:
+                continue
+            idx = (arr[r][cols] * weights).sum(axis=1)
+            if counts[everything, idx].min() >= 2:
+                counts[everything, idx] -= 1
+                keep[r] = False
+
+    return arr[keep]
+
+
+"""
+A row of a streamed covering array: the row, the number of interactions it covers that no earlier row did,
+and the number and fraction of all the t-way interactions covered so far
+"""
+StreamedRow = namedtuple('StreamedRow', ['row', 'new', 'covered', 'coverage'])
+
+
+"""
+Yields the rows of a covering array one at a time as StreamedRow, the row covering the most interactions not covered
+by the rows before it first (ties go to the earlier row). The rows that add nothing come last, in their original order.
+Gains are kept exact without rescoring every row: once a row is taken, each other row loses one for every
+newly covered interaction it holds too, found by comparing the rows with the taken one on the columns
+of the newly covered interactions, so the work per row is proportional to what it covered.
+With constraints the interactions no valid row can hold do not count towards the total the coverage fraction is
+relative to.
+"""
+def stream_rows(ca,t,v,constraints=None):
+    arr = np.asarray(ca, dtype=np.intp)
+    if len(arr) == 0:
+        return
+    sizes = column_sizes(v,arr.shape[1])
+    cols = np.concatenate(list(comb_chunks(arr.shape[1],t,VERIFY_CHUNK)))
+    radix = sizes[cols]
+    weights = radix_weights(radix)
+    size = max_interactions(sizes,t)
+    #uncovered interactions, codes past a combination's own number of interactions are never hit
+    uncovered = np.arange(size) < radix.prod(axis=1)[:, None]
+    constraints = as_constraints(sizes,constraints)
+    everything = np.arange(len(cols))
+    if constraints is not None:
+        uncovered &= ~constraints.forbidden_mask(cols,radix,weights,size)
+        #of the interactions no row holds, the ones the forbidden tuples imply are left out too
+        held = np.zeros_like(uncovered)
+        for row in arr:
+            held[everything, (row[cols] * weights).sum(axis=1)] = True
+        uncovered &= ~constraints.unreachable_mask(cols,radix,weights,uncovered & ~held)
+    total = int(uncovered.sum())
+    chunk_size = max(1, VERIFY_CHUNK // (len(arr) * t))
+
+    gains = np.array([uncovered[everything, (row[cols] * weights).sum(axis=1)].sum() for row in arr])
+    taken = np.zeros(len(arr), dtype=bool)
+    covered = 0
+    while True:
+        r = int(np.argmax(np.where(taken, -1, gains)))
+        if taken[r] or gains[r] <= 0:
+            break
+        idx = (arr[r][cols] * weights).sum(axis=1)
+        new = np.nonzero(uncovered[everything, idx])[0]
+        uncovered[new, idx[new]] = False
+        #rows that agree with r on all the columns of a newly covered interaction held it too
+        same = arr == arr[r]
+        for start in range(0, len(new), chunk_size):
+            gains -= same[:, cols[new[start:start+chunk_size]]].all(axis=2).sum(axis=1)
+        taken[r] = True
+        covered += len(new)
+        yield StreamedRow(arr[r], len(new), covered, covered / total if total else 1.0)
+
+    #rows that add nothing, in their original order
+    for r in np.nonzero(~taken)[0]:
+        yield StreamedRow(arr[r], 0, covered, covered / total if total else 1.0)
+
+
+"""
+Coverage-prioritized order of a covering array
+Returns the rows of ca as a 2-D array reordered by stream_rows, so that any first M rows cover as many t-way
+interactions as greedy selection can, which is what matters when a budget only allows running a prefix
+"""
+def order_rows(ca,t,v,constraints=None):
+    arr = np.asarray(ca, dtype=np.intp)
+    ordered = np.empty_like(arr)
+    for r, streamed in enumerate(stream_rows(arr,t,v,constraints)):
+        ordered[r] = streamed.row
+    return ordered
+
+
+"""
+Coverage-vs-rows curve of an array in its given order
+Returns a float array whose entry m is the fraction of the t-way interactions covered by the first m+1 rows
+(interactions no valid row can hold left out of the total with constraints). Each combination chunk finds the first row holding
+every interaction with one np.unique over its codes, so the whole curve is one pass over the array.
+"""
+def coverage_curve(ca,t,v,constraints=None):
+    arr = np.asarray(ca, dtype=np.intp)
+    sizes = column_sizes(v,arr.shape[1])
+    size = max_interactions(sizes,t)
+    constraints = as_constraints(sizes,constraints)
+    new = np.zeros(len(arr) + 1, dtype=np.int64)
+    total = 0
+    chunk_size = max(1, VERIFY_CHUNK // max(len(arr), 1))
+    arr_t = np.ascontiguousarray(arr.T)
+    for cols in comb_chunks(arr.shape[1],t,chunk_size):
+        radix = sizes[cols]
+        weights = radix_weights(radix)
+        allowed = np.arange(size) < radix.prod(axis=1)[:, None]
+        codes = (arr_t[cols] * weights[:, :, None]).sum(axis=1) + (np.arange(len(cols)) * size)[:, None]
+        #first row holding each interaction that some row holds
+        held, first = np.unique(codes.ravel(), return_index=True)
+        if constraints is not None:
+            allowed &= ~constraints.forbidden_mask(cols,radix,weights,size)
+            absent = allowed.copy()
+            absent.ravel()[held] = False
+            allowed &= ~constraints.unreachable_mask(cols,radix,weights,absent)
+        total += int(allowed.sum())
+        keep = allowed.ravel()[held]
+        new += np.bincount(first[keep] % len(arr), minlength=len(arr) + 1)
+    return np.cumsum(new[:-1]) / total if total else np.ones(len(arr))
+
+
+"""
+Number of leading rows a coverage curve needs to reach the given fraction of the interactions,
+or None if the whole array does not reach it
+"""
+def rows_for_coverage(curve,fraction):
+    m = int(np.searchsorted(curve, fraction - 1e-12))
+    return m + 1 if m < len(curve) else None
+
+
+"""
+Result of anneal: the smallest covering array found, the number of rows before and after, the seconds and moves
+spent, and trace, a list of (seconds, rows) with an entry each time a smaller covering array was reached
+"""
+AnnealResult = namedtuple('AnnealResult', ['ca', 'initial_rows', 'rows', 'seconds', 'moves', 'trace'])
+
+
+#lowest temperature of anneal, low enough that worse moves are practically never accepted
+MIN_TEMPERATURE = 1e-6
+
+
+"""
+Simulated annealing post-optimizer
+Starts from a covering array without don't care values (the output of ipo or any IPO variant) and tries to make it
+smaller: whenever the array covers every interaction, the row covering the fewest interactions no other row does is
+removed, then moves repair the interactions that went missing. A move takes a missing interaction and writes its
+values into one of sample_rows random rows, the row whose change leaves the fewest interactions missing. Moves
+that make things worse are accepted with probability exp(-delta / T), T starting at temperature, multiplied by
+cooling after every move (down to MIN_TEMPERATURE) and reset after every removal.
+The multiplicity table is updated a cell at a time, so a cell change only touches the C(k-1, t-1) combinations
+through its column.
+Stops after time_budget seconds or max_moves moves, whichever comes first (None for no limit on one of them).
+With constraints no row ever violates them and the interactions no valid row can hold need no covering.
+"""
+def anneal(ca,t,v,time_budget=1.0,seed=None,constraints=None,max_moves=None,sample_rows=8,temperature=1.0,
+           cooling=0.999):
+    start = time.perf_counter()
+    if time_budget is None and max_moves is None:
+        raise ValueError('anneal needs a time budget or a maximum number of moves')
+    if temperature <= 0 or not 0 < cooling <= 1:
+        raise ValueError('temperature must be positive and cooling in (0, 1]')
+    rng = np.random.default_rng(seed)
+    arr = np.array(ca, dtype=np.intp)
+    if (arr == DC).any():
+        raise ValueError("anneal needs an array without don't care values")
+    sizes = column_sizes(v,arr.shape[1])
+    constraints = as_constraints(sizes,constraints)
+    cols, weights, counts = interaction_counts(arr,t,v)
+    radix = sizes[cols]
+    size = counts.shape[1]
+    #interactions that must be covered
+    required = np.arange(size) < radix.prod(axis=1)[:, None]
+    if constraints is not None:
+        required &= ~constraints.forbidden_mask(cols,radix,weights,size)
+        required &= ~constraints.unreachable_mask(cols,radix,weights,(counts == 0) & required)
+    if ((counts == 0) & required).any():
+        raise ValueError('ca is not a covering array')
+    #combinations through each column and the weight of the column in them
+    by_col = [np.nonzero((cols == c).any(axis=1))[0] for c in range(arr.shape[1])]
+    col_w = [weights[j][cols[j] == c] for c, j in enumerate(by_col)]
+    everything = np.arange(len(cols))
+
+    #sets cell (r, c) to value, returns the change in the number of missing interactions
+    def change(r,c,value):
+        j = by_col[c]
+        idx = (arr[r][cols[j]] * weights[j]).sum(axis=1)
+        new_idx = idx + (value - arr[r, c]) * col_w[c]
+        counts[j, idx] -= 1
+        lost = int((counts[j, idx] == 0).sum())
+        gained = int((counts[j, new_idx] == 0).sum())
+        counts[j, new_idx] += 1
+        arr[r, c] = value
+        return lost - gained
+
+    #writes vals into the columns combination, returns the change and the values it replaced
+    def write(r,comb,vals):
+        old = arr[r, comb].copy()
+        delta = 0
+        for c, value in zip(comb, vals):
+            if arr[r, c] != value:
+                delta += change(r,c,value)
+        return delta, old
+
+    best = arr.copy()
+    trace = [(0.0, len(arr))]
+    missing = 0
+    pool, pos = [], 0
+    moves = 0
+    temp = temperature
+    while (time_budget is None or time.perf_counter() - start < time_budget) and (max_moves is None or moves < max_moves):
+        if missing == 0:
+            if len(arr) < len(best):
+                best = arr.copy()
+                trace.append((time.perf_counter() - start, len(arr)))
+            if len(arr) <= 1:
+                break
+            #row covering the fewest interactions no other row does, read from the multiplicity table
+            unique = [(counts[everything, (row[cols] * weights).sum(axis=1)] == 1).sum() for row in arr]
+            r = int(np.argmin(unique))
+            idx = (arr[r][cols] * weights).sum(axis=1)
+            counts[everything, idx] -= 1
+            missing = int((counts[everything, idx] == 0).sum())
+            arr = np.delete(arr, r, axis=0)
+            pool, pos = [], 0
+            temp = temperature
+            continue
+
+        #missing interactions, listed again in random order once the last list is used up
+        if pos == len(pool):
+            pool = np.argwhere((counts == 0) & required)
+            rng.shuffle(pool)
+            pos = 0
+        j, code = pool[pos]
+        pos += 1
+        if counts[j, code]:
+            continue
+        comb = cols[j]
+        vals = (code // weights[j]) % radix[j]
+
+        chosen, chosen_delta = None, None
+        for r in rng.choice(len(arr), min(sample_rows, len(arr)), replace=False):
+            if constraints is not None:
+                test = arr[r].copy()
+                test[comb] = vals
+                if constraints.violates(test[None, :])[0]:
+                    continue
+            delta, old = write(r,comb,vals)
+            write(r,comb,old)
+            if chosen is None or delta < chosen_delta:
+                chosen, chosen_delta = r, delta
+        moves += 1
+        if chosen is not None and (chosen_delta <= 0 or rng.random() < math.exp(-chosen_delta / temp)):
+            missing += write(chosen,comb,vals)[0]
+        #kept above 0 so exp(-delta / T) stays defined however long no row is removed
+        temp = max(temp * cooling, MIN_TEMPERATURE)
+
+    return AnnealResult(best, trace[0][1], len(best), time.perf_counter() - start, moves, trace)
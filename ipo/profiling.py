@@ -0,0 +1,92 @@
+import time
+
+"""
+Growth profiling
+A GrowthProfile passed to ipo, extend or grow records where a run spends its time, step by step. The engine only
+touches it behind 'if profile is not None' checks, so a run without one does no timing at all.
+"""
+
+#phases of a growth step, in the order they run
+PHASES = ('combinations', 'horizontal', 'vertical', 'fill')
+
+
+"""
+Record of one growth step
+column is the first new column and num_new the number of columns added, rows the size of the array before the step
+and rows_added the rows vertical growth added. seconds maps each phase to its time, the phases a step skips are 0.
+candidates is the number of (partial) candidate assignments horizontal growth scored, interactions the number of
+interactions the step had to cover, covered_horizontally and covered_vertically how many each growth covered
+"""
+class StepProfile:
+    def __init__(self,column,num_new,rows):
+        self.column = column
+        self.num_new = num_new
+        self.rows = rows
+        self.rows_added = 0
+        self.seconds = dict.fromkeys(PHASES, 0.0)
+        self.candidates = 0
+        self.interactions = 0
+        self.covered_horizontally = 0
+        self.covered_vertically = 0
+        self.clock = time.perf_counter()
+
+    #adds the time since the last lap to phase and restarts the clock
+    def lap(self,phase):
+        now = time.perf_counter()
+        self.seconds[phase] += now - self.clock
+        self.clock = now
+
+    def as_dict(self):
+        return {'column': self.column, 'num_new': self.num_new, 'rows': self.rows, 'rows_added': self.rows_added,
+                'seconds': dict(self.seconds), 'candidates': self.candidates, 'interactions': self.interactions,
+                'covered_horizontally': self.covered_horizontally, 'covered_vertically': self.covered_vertically}
+
+
+"""
+Profile of a whole run, a StepProfile per growth step plus the time of the work done outside the steps
+(the initial block, the final don't care fill and row reduction) in seconds.
+callback, when given, is called with each StepProfile as soon as its step is done
+"""
+class GrowthProfile:
+    def __init__(self,callback=None):
+        self.steps = []
+        self.seconds = {}
+        self.callback = callback
+
+    def start_step(self,column,num_new,rows):
+        step = StepProfile(column,num_new,rows)
+        self.steps.append(step)
+        return step
+
+    def end_step(self,step,rows):
+        step.rows_added = rows - step.rows
+        if self.callback is not None:
+            self.callback(step)
+
+    #adds the time since start to a phase outside the steps, returns the current time
+    def record(self,phase,start):
+        now = time.perf_counter()
+        self.seconds[phase] = self.seconds.get(phase, 0.0) + now - start
+        return now
+
+    #total time per phase over the steps, followed by the phases outside them
+    def totals(self):
+        totals = {phase: sum(step.seconds[phase] for step in self.steps) for phase in PHASES}
+        totals.update(self.seconds)
+        return totals
+
+    def as_dict(self):
+        return {'steps': [step.as_dict() for step in self.steps], 'seconds': dict(self.seconds), 'totals': self.totals()}
+
+    #table of the steps and the totals, one line each
+    def summary(self):
+        lines = ['column  new   rows  added  interactions  horizontal  vertical  candidates  ' +
+                 '  '.join(phase.rjust(12) for phase in PHASES)]
+        for s in self.steps:
+            lines.append(str(s.column).rjust(6) + str(s.num_new).rjust(5) + str(s.rows).rjust(7) +
+                         str(s.rows_added).rjust(7) + str(s.interactions).rjust(14) +
+                         str(s.covered_horizontally).rjust(12) + str(s.covered_vertically).rjust(10) +
+                         str(s.candidates).rjust(12) + '  ' +
+                         '  '.join(('%.4f' % s.seconds[phase]).rjust(12) for phase in PHASES))
+        lines.append('total ' + ', '.join(phase + ' ' + '%.4f' % seconds + ' s' for phase, seconds in self.totals().items()))
+        return '\n'.join(lines)
@@ -0,0 +1,226 @@
+import numpy as np
+from collections import namedtuple
+import os
+import time
+import json
+import hashlib
+from contextlib import contextmanager
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+from .coverage import column_sizes
+from .verify import is_covering_array
+from .engine import ipo
+
+"""
+Storage
+A compact binary format for covering arrays, memory-mapped when loaded, and a disk cache of generated arrays
+"""
+
+#magic bytes at the start of a stored covering array
+ARRAY_MAGIC = b'\x93IPOCA\x01'
+
+
+#the data of a stored covering array starts at a multiple of this many bytes
+ARRAY_ALIGN = 64
+
+
+#rows written or yielded at a time when streaming a stored covering array
+ROW_CHUNK = 1 << 16
+
+
+StoredArray = namedtuple('StoredArray', ['ca', 't', 'k', 'v', 'seed', 'variant'])
+
+
+"""
+Writes a finished covering array to path in a compact binary layout
+The file holds ARRAY_MAGIC, the length of the header as 4 little-endian bytes and a JSON header with t, k, the alphabet
+size of every column, seed, variant, the element type and the number of rows, padded with spaces so that the data
+starts at a multiple of ARRAY_ALIGN bytes. The rows follow one after another, one byte per cell (two little-endian
+bytes when an alphabet has more than 256 values).
+seed and variant are kept as given to describe how the array was made, so they must be JSON values.
+"""
+def save_array(path,ca,t,v,seed=None,variant=None):
+    arr = np.asarray(ca)
+    if arr.ndim != 2:
+        raise ValueError('ca must be a 2-D array')
+    k = arr.shape[1]
+    sizes = column_sizes(v,k)
+    if sizes.max(initial=0) > 1 << 16:
+        raise ValueError('alphabets of more than 65536 values can not be stored')
+    if ((arr < 0) | (arr >= sizes)).any():
+        raise ValueError('ca holds values out of range of the alphabet sizes')
+    dtype = np.dtype('<u1' if sizes.max(initial=0) <= 256 else '<u2')
+
+    header = {'t': int(t), 'k': k, 'v': sizes.tolist(), 'seed': seed, 'variant': variant,
+              'dtype': dtype.name, 'rows': len(arr)}
+    header = json.dumps(header).encode()
+    header += b' ' * (-(len(ARRAY_MAGIC) + 4 + len(header)) % ARRAY_ALIGN)
+    with open(path, 'wb') as f:
+        f.write(ARRAY_MAGIC)
+        f.write(len(header).to_bytes(4, 'little'))
+        f.write(header)
+        for start in range(0, len(arr), ROW_CHUNK):
+            f.write(arr[start:start+ROW_CHUNK].astype(dtype).tobytes())
+
+
+"""
+Reads a covering array written by save_array
+Returns a StoredArray, whose ca is a read-only np.memmap of the rows unless mmap is False, in which case the rows are
+read into memory. Either way ca can go straight to is_covering_array, extend or reduce_rows.
+"""
+def load_array(path,mmap=True):
+    with open(path, 'rb') as f:
+        if f.read(len(ARRAY_MAGIC)) != ARRAY_MAGIC:
+            raise ValueError(str(path) + ' is not a stored covering array')
+        length = int.from_bytes(f.read(4), 'little')
+        header = json.loads(f.read(length))
+        offset = f.tell()
+
+    dtype = np.dtype(header['dtype']).newbyteorder('<')
+    shape = (header['rows'], header['k'])
+    if mmap and header['rows'] > 0:
+        ca = np.memmap(path, dtype=dtype, mode='r', offset=offset, shape=shape)
+    else:
+        ca = np.fromfile(path, dtype=dtype, count=shape[0] * shape[1], offset=offset).reshape(shape)
+    return StoredArray(ca, header['t'], header['k'], header['v'], header['seed'], header['variant'])
+
+
+"""
+Yields the rows of a stored covering array (a path or a StoredArray) as integer arrays, reading chunk_size rows
+at a time so a test runner never holds more than that in memory
+"""
+def iter_rows(stored,chunk_size=ROW_CHUNK):
+    if not isinstance(stored, StoredArray):
+        stored = load_array(stored)
+    for start in range(0, len(stored.ca), chunk_size):
+        yield from np.asarray(stored.ca[start:start+chunk_size], dtype=np.intp)
+
+
+"""
+Disk-backed cache of generated covering arrays
+Arrays are stored with save_array in directory, keyed by (t, k, column sizes, variant, seed), next to an index
+file that keeps the size and last use of every entry. Once the entries go over max_entries or max_bytes (None for
+no bound), the least recently used ones are evicted. An array is verified with is_covering_array when inserted.
+A request with no entry of its own is answered from an entry for more columns with the same t, variant and seed
+whose first k column sizes match, keeping its first k columns, since deleting columns keeps the covering property.
+variant is any JSON value telling how the array was made, generate uses the stride, plus the strategy and beam
+width when the strategy is not 'exhaustive'. Only seeds that are None or JSON values can be keys.
+Several processes can share a directory: arrays and the index are written to temporary files and renamed into place,
+and every read-modify-write of the index holds an exclusive lock on the lock file (fcntl.flock, where available).
+"""
+class ArrayCache:
+
+    INDEX = 'index.json'
+    LOCK = 'index.lock'
+
+    def __init__(self,directory,max_entries=None,max_bytes=None):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+
+    #exclusive lock of the cache directory, held while the index is read and written back
+    @contextmanager
+    def locked(self):
+        with open(os.path.join(self.directory, self.LOCK), 'a') as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def read_index(self):
+        try:
+            with open(os.path.join(self.directory, self.INDEX)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return []
+
+    #writes to a temporary file first so that a reader never sees half an index
+    def write_index(self,index):
+        path = os.path.join(self.directory, self.INDEX)
+        tmp = path + '.' + str(os.getpid()) + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(index, f)
+        os.replace(tmp, path)
+
+    def __len__(self):
+        return len(self.read_index())
+
+    #returns the cached array as a 2-D integer array, or None when there is none
+    def get(self,t,k,v,variant=1,seed=0):
+        sizes = column_sizes(v,k).tolist()
+        with self.locked():
+            index = self.read_index()
+            usable = [e for e in index if e['t'] == t and e['variant'] == variant and e['seed'] == seed
+                      and e['k'] >= k and e['v'][:k] == sizes]
+            if not usable:
+                self.misses += 1
+                return None
+            #an exact entry if there is one, otherwise the one with the fewest columns
+            entry = min(usable, key=lambda e: e['k'])
+            try:
+                ca = np.array(load_array(os.path.join(self.directory, entry['file'])).ca[:, :k], dtype=np.intp)
+            except FileNotFoundError:
+                self.write_index([e for e in index if e is not entry])
+                self.misses += 1
+                return None
+            entry['used'] = time.time()
+            self.write_index(index)
+        self.hits += 1
+        return ca
+
+    #verifies and stores an array, raising ValueError if it is not a covering array
+    def put(self,ca,t,k,v,variant=1,seed=0):
+        sizes = column_sizes(v,k)
+        arr = np.asarray(ca)
+        if arr.ndim != 2 or arr.shape[1] != k or not is_covering_array(arr,t,k,sizes):
+            raise ValueError('not a covering array of strength ' + str(t) + ' for the given k and v')
+        key = json.dumps([t, sizes.tolist(), variant, seed])
+        name = 'ca-' + hashlib.sha1(key.encode()).hexdigest()[:16] + '.ca'
+        path = os.path.join(self.directory, name)
+        #written under a temporary name, a reader never maps half a file
+        tmp = path + '.' + str(os.getpid()) + '.tmp'
+        save_array(tmp,arr,t,sizes,seed,variant)
+        with self.locked():
+            os.replace(tmp, path)
+            index = [e for e in self.read_index() if json.dumps([e['t'], e['v'], e['variant'], e['seed']]) != key]
+            index.append({'file': name, 't': t, 'k': k, 'v': sizes.tolist(), 'variant': variant, 'seed': seed,
+                          'bytes': os.path.getsize(path), 'used': time.time()})
+            self.evict(index)
+
+    #drops the least recently used entries until the index fits the bounds, then writes it.
+    #Array files the index does not list (left by a process that died between writing a file and indexing it)
+    #are removed too. Called with the lock held
+    def evict(self,index):
+        index.sort(key=lambda e: e['used'])
+        while index and ((self.max_entries is not None and len(index) > self.max_entries) or
+                         (self.max_bytes is not None and sum(e['bytes'] for e in index) > self.max_bytes)):
+            entry = index.pop(0)
+            try:
+                os.remove(os.path.join(self.directory, entry['file']))
+            except FileNotFoundError:
+                pass
+        listed = {e['file'] for e in index}
+        for name in os.listdir(self.directory):
+            if name.startswith('ca-') and name.endswith('.ca') and name not in listed:
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except FileNotFoundError:
+                    pass
+        self.write_index(index)
+
+    #the cached array for these arguments, generated with ipo and inserted when there is none
+    def generate(self,t,k,v,variant=1,seed=0,strategy='exhaustive',beam_width=8):
+        key = variant if strategy == 'exhaustive' else [variant, strategy, beam_width]
+        ca = self.get(t,k,v,key,seed)
+        if ca is None:
+            ca = ipo(t,k,v,variant,strategy,beam_width,seed)
+            self.put(ca,t,k,v,key,seed)
+        return ca
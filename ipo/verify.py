@@ -0,0 +1,116 @@
+import numpy as np
+from collections import namedtuple
+from .coverage import column_sizes, radix_weights, comb_chunks, max_interactions
+from .constraints import as_constraints
+
+"""
+Verification
+Checks that an array covers every t-way interaction, and counts how many rows cover each of them
+"""
+
+"""
+Result of is_covering_array
+covered tells if every t-way interaction appears in some row, num_missing is the number of interactions that do not,
+and missing lists them as (column positions, values) pairs when they were requested (otherwise it is None).
+The result is truthy exactly when the array is a covering array.
+"""
+class CoverageReport(namedtuple('CoverageReport', ['covered', 'num_missing', 'missing'])):
+
+    def __bool__(self):
+        return bool(self.covered)
+
+
+#number of array cells encoded at once by is_covering_array, bounds its memory
+VERIFY_CHUNK = 1 << 22
+
+
+"""
+Given a covering array and values of t, k and v, this function returns
+a CoverageReport that indicates if the given array is a covering array given the
+values of t, k and v, where v is one alphabet size or a list of per-column sizes.
+The array can be a list of rows or a 2-D integer array. Column combinations are checked in chunks,
+the rows' values for each combination are encoded as mixed-radix integers and counted with one bincount per chunk.
+Set list_missing to get the missing interactions and verbose to print the verdict.
+With constraints (see Constraints) the interactions no valid row can hold, forbidden ones and the ones they imply,
+are not required to appear.
+"""
+def is_covering_array(ca,t,k,v,list_missing=False,verbose=False,constraints=None):
+    arr = np.asarray(ca)
+    if arr.ndim != 2:
+        arr = arr.reshape(len(arr), -1)
+    arr = arr[:, :k]
+    #small unsigned arrays (like the ones load_array maps) are used as they are, codes are computed in int32 anyway
+    if not (arr.dtype.kind == 'u' and arr.dtype.itemsize <= 2):
+        arr = arr.astype(np.int32)
+    sizes = column_sizes(v,k)
+    #rows with a value outside range(v) in a combination do not cover anything there
+    valid = (arr >= 0) & (arr < sizes)
+    all_valid = bool(valid.all())
+    arr_t = np.ascontiguousarray(arr.T)
+    #interactions of the largest combination, every combination gets this many codes
+    size = max_interactions(sizes,t)
+    constraints = as_constraints(sizes,constraints)
+
+    num_missing = 0
+    missing = [] if list_missing else None
+    chunk_size = max(1, min(VERIFY_CHUNK // max(len(arr), 1), np.iinfo(np.int32).max // size - 1))
+    for cols in comb_chunks(k,t,chunk_size):
+        radix = sizes[cols]
+        weights = radix_weights(radix).astype(np.int32)
+        #encoded interaction of every row for every combination in the chunk, shape (combinations, rows)
+        codes = (np.arange(len(cols), dtype=np.int32) * size)[:, None]
+        for j in range(t):
+            codes = codes + arr_t[cols[:, j]] * weights[:, j:j+1]
+        if not all_valid:
+            codes = np.where(valid.T[cols].all(axis=1), codes, len(cols) * size)
+        counts = np.bincount(codes.ravel(), minlength=len(cols) * size + 1)[:len(cols) * size].reshape(len(cols), size)
+        absent = (counts == 0) & (np.arange(size) < radix.prod(axis=1)[:, None])
+        if constraints is not None:
+            absent &= ~constraints.forbidden_mask(cols,radix,weights,size)
+            absent &= ~constraints.unreachable_mask(cols,radix,weights,absent)
+        num_missing += int(absent.sum())
+        if list_missing:
+            for c, idx in zip(*np.nonzero(absent)):
+                vals = [int(idx) // int(w) % int(r) for w, r in zip(weights[c], radix[c])]
+                missing.append((tuple(int(p) for p in cols[c]), vals))
+
+    report = CoverageReport(num_missing == 0, num_missing, missing)
+    if verbose:
+        print("COVERING ARRAY!" if report.covered else "NOT A COVERING ARRAY")
+    return report
+
+
+"""
+Multiplicity table of an array
+Returns the t-way column combinations (one per row, lexicographic order), their radix weights and, for every
+combination, the number of rows covering each of its interactions, encoded as mixed-radix integers
+"""
+def interaction_counts(arr,t,v):
+    cols = np.concatenate(list(comb_chunks(arr.shape[1],t,VERIFY_CHUNK)))
+    sizes = column_sizes(v,arr.shape[1])
+    weights = radix_weights(sizes[cols])
+    size = max_interactions(sizes,t)
+    counts = np.zeros((len(cols), size), dtype=np.uint16 if len(arr) < 2**16 else np.uint32)
+    chunk_size = max(1, VERIFY_CHUNK // max(len(arr), 1))
+    arr_t = np.ascontiguousarray(arr.T)
+    for start in range(0, len(cols), chunk_size):
+        chunk = cols[start:start+chunk_size]
+        codes = (arr_t[chunk] * weights[start:start+chunk_size, :, None]).sum(axis=1) + (np.arange(len(chunk)) * size)[:, None]
+        counts[start:start+chunk_size] = np.bincount(codes.ravel(), minlength=len(chunk) * size).reshape(len(chunk), size)
+    return cols, weights, counts
+
+
+"""
+Returns for each row of a covering array the number of t-way interactions that no other row covers
+"""
+def unique_coverage(ca,t,v):
+    arr = np.asarray(ca, dtype=np.intp)
+    cols, weights, counts = interaction_counts(arr,t,v)
+    unique = np.zeros(len(arr), dtype=np.int64)
+    chunk_size = max(1, VERIFY_CHUNK // max(len(arr), 1))
+    arr_t = np.ascontiguousarray(arr.T)
+    for start in range(0, len(cols), chunk_size):
+        chunk = cols[start:start+chunk_size]
+        codes = (arr_t[chunk] * weights[start:start+chunk_size, :, None]).sum(axis=1)
+        unique += (counts[start:start+chunk_size][np.arange(len(chunk))[:, None], codes] == 1).sum(axis=0)
+    return unique
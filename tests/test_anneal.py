@@ -0,0 +1,38 @@
+import pytest
+from ipo import ipo, anneal, is_covering_array, Constraints
+
+
+def test_anneal_keeps_covering_array():
+    ca = ipo(2,10,3,seed=1)
+    result = anneal(ca,2,3,time_budget=None,max_moves=2000,seed=0)
+    assert result.initial_rows == len(ca)
+    assert result.rows == len(result.ca) <= len(ca)
+    assert result.trace[-1][1] == result.rows
+    assert is_covering_array(result.ca,2,10,3).covered
+
+
+def test_anneal_same_seed_same_result():
+    ca = ipo(2,8,3,seed=2)
+    first = anneal(ca,2,3,time_budget=None,max_moves=500,seed=4)
+    second = anneal(ca,2,3,time_budget=None,max_moves=500,seed=4)
+    assert (first.ca == second.ca).all()
+
+
+#the temperature must not reach 0 however fast it cools
+def test_anneal_fast_cooling():
+    result = anneal(ipo(2,12,3,seed=0),2,3,time_budget=None,max_moves=5000,seed=0,cooling=0.5)
+    assert is_covering_array(result.ca,2,12,3).covered
+
+
+def test_anneal_with_constraints():
+    v = [3,3,2,2,2]
+    constraints = Constraints(v,[{0:0,1:1}, {2:1,3:0}])
+    ca = ipo(2,5,v,seed=1,constraints=constraints)
+    result = anneal(ca,2,v,time_budget=None,max_moves=1000,seed=0,constraints=constraints)
+    assert not constraints.violates(result.ca).any()
+    assert is_covering_array(result.ca,2,5,v,constraints=constraints).covered
+
+
+def test_anneal_rejects_non_covering_arrays():
+    with pytest.raises(ValueError):
+        anneal(ipo(2,6,3,seed=0)[1:],2,3)
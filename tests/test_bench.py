@@ -0,0 +1,85 @@
+import sys
+import pytest
+from ipo import (ipo, iter_trials, run_trials, SizeStats, best_of, run_suite, suite_summary, save_suite, load_suite,
+                 compare_suite, print_suite)
+from ipo.bench import trial_size
+
+
+def test_iter_trials_same_results_whatever_the_workers():
+    args = (2,8,3,1,'exhaustive',8)
+    serial = [(child.spawn_key, size) for child, size in iter_trials(trial_size,args,12,workers=1,seed=3)]
+    parallel = [(child.spawn_key, size) for child, size in iter_trials(trial_size,args,12,workers=3,seed=3)]
+    assert serial == parallel
+    assert [key for key, _ in serial] == [(i,) for i in range(12)]
+
+
+def test_trial_seed_rebuilds_the_array():
+    for child, size in iter_trials(trial_size,(2,8,3,2,'exhaustive',8),4,workers=1,seed=0):
+        assert len(ipo(2,8,3,2,seed=child)) == size
+
+
+#the early stop counts trials in seed order, so it stops at the same trial with any number of workers
+def test_run_trials_early_stop_same_whatever_the_workers():
+    serial = run_trials(200,2,10,3,workers=1,seed=0,ci_tol=0.4,min_trials=10)
+    parallel = run_trials(200,2,10,3,workers=3,seed=0,ci_tol=0.4,min_trials=10)
+    assert 10 <= serial.n < 200
+    assert (serial.n, serial.mean, serial.counts) == (parallel.n, parallel.mean, parallel.counts)
+
+
+def test_size_stats():
+    stats = SizeStats()
+    for size in [3, 1, 2, 2, 7]:
+        stats.add(size)
+    assert (stats.n, stats.min(), stats.max(), stats.mean) == (5, 1, 7, 3.0)
+    assert stats.percentile(50) == 2
+    assert stats.std() == pytest.approx(2.345207879911715)
+
+
+def test_best_of_keeps_the_smallest_array():
+    best = best_of(10,2,10,3,variant=2,seed=1)
+    sizes = [len(ca) for _, ca in iter_trials(ipo,(2,10,3,2,'exhaustive',8),10,workers=1,seed=1)]
+    assert best.trials == 10
+    assert len(best.ca) == min(sizes)
+    assert (ipo(2,10,3,2,seed=best.seed) == best.ca).all()
+
+
+#CA(2,3,3) from the product block has v**t rows, nothing can be smaller
+def test_best_of_stops_at_the_lower_bound():
+    best = best_of(50,2,3,3,seed=0)
+    assert (best.trials, len(best.ca)) == (1, 9)
+
+
+def test_best_of_time_budget():
+    assert best_of(50,2,10,3,seed=0,time_budget=0).trials == 1
+
+
+def test_run_suite_and_compare(tmp_path):
+    suite = run_suite([(2,6,3)],variants=[1,2],strategies=['exhaustive','greedy'],repeats=2)
+    assert len(suite['runs']) == 8
+    assert {'N', 'wall', 'cpu', 'peak_bytes', 'seed'} <= set(suite['runs'][0])
+    path = str(tmp_path / 'suite.json')
+    save_suite(suite,path)
+    baseline = load_suite(path)
+    assert baseline == suite
+    assert compare_suite(suite,baseline) == []
+
+    #larger arrays are regressions, timings and memory under the noise thresholds are not
+    runs = [dict(run, N=run['N'] + 1, cpu=run['cpu'] * 10, peak_bytes=run['peak_bytes'] * 10) for run in suite['runs']]
+    worse = {'machine': suite['machine'], 'runs': runs}
+    regressions = compare_suite(worse,baseline)
+    assert {r.metric for r in regressions} == {'N'}
+    assert len(regressions) == len(suite_summary(suite))
+
+
+#configurations are compared on the seeds both suites ran
+def test_compare_suite_common_seeds():
+    suite = run_suite([(2,6,3)],variants=[1],strategies=['exhaustive'],repeats=2)
+    extra = {'machine': suite['machine'], 'runs': suite['runs'] + [dict(suite['runs'][0], seed=9, N=1000)]}
+    assert compare_suite(extra,suite) == []
+
+
+def test_print_suite_to_file(capsys):
+    suite = run_suite([(2,5,2)],variants=[1],strategies=['exhaustive'],repeats=1)
+    print_suite(suite,file=sys.stderr)
+    out = capsys.readouterr()
+    assert out.out == '' and out.err.startswith('CA(2,5,2) IPO 1 exhaustive: N = ')
@@ -0,0 +1,37 @@
+import os
+import numpy as np
+import pytest
+from ipo import ArrayCache
+
+
+def test_cache_hit_and_truncation(tmp_path):
+    cache = ArrayCache(tmp_path)
+    ca = cache.generate(2,8,3,seed=1)
+    assert cache.misses == 1
+    assert (cache.generate(2,8,3,seed=1) == ca).all()
+    #an array for fewer columns is the first columns of the stored one
+    assert (cache.get(2,6,3,seed=1) == ca[:, :6]).all()
+    assert cache.hits == 2
+    assert cache.get(2,8,3,seed=2) is None
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = ArrayCache(tmp_path,max_entries=2)
+    for seed in range(3):
+        cache.generate(2,5,3,seed=seed)
+    assert len(cache) == 2
+    assert cache.get(2,5,3,seed=0) is None
+    assert cache.get(2,5,3,seed=2) is not None
+    assert len([name for name in os.listdir(tmp_path) if name.endswith('.ca')]) == 2
+
+
+def test_cache_removes_orphan_files(tmp_path):
+    cache = ArrayCache(tmp_path)
+    (tmp_path / 'ca-0000000000000000.ca').write_bytes(b'')
+    cache.generate(2,5,3,seed=0)
+    assert not (tmp_path / 'ca-0000000000000000.ca').exists()
+
+
+def test_cache_rejects_non_covering_arrays(tmp_path):
+    with pytest.raises(ValueError):
+        ArrayCache(tmp_path).put(np.zeros((3,4), dtype=int),2,4,2)
@@ -0,0 +1,67 @@
+import json
+import os
+import subprocess
+import sys
+import numpy as np
+import pytest
+from ipo import is_covering_array, load_array
+from ipo.cli import main, read_array
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.mark.parametrize('fmt', ['csv', 'npy', 'json', 'ca'])
+def test_generate_then_verify(tmp_path,capsys,fmt):
+    path = str(tmp_path / ('a.' + fmt))
+    assert main(['generate', '-t', '2', '-k', '6', '-v', '3', '--seed', '1', '-o', path]) == 0
+    ca, _, _ = read_array(path)
+    assert is_covering_array(ca,2,6,3).covered
+    capsys.readouterr()
+    args = ['verify', path] if fmt in ('json', 'ca') else ['verify', path, '-t', '2', '-v', '3']
+    assert main(args) == 0
+    assert json.loads(capsys.readouterr().out) == {'covered': True, 'missing': 0, 'rows': len(ca), 't': 2, 'k': 6}
+
+
+def test_generate_same_seed_same_output(capsys):
+    main(['generate', '-t', '2', '-k', '8', '-v', '3', '--seed', '5'])
+    first = capsys.readouterr().out
+    main(['generate', '-t', '2', '-k', '8', '-v', '3', '--seed', '5'])
+    assert capsys.readouterr().out == first
+
+
+def test_verify_exit_status_1_when_not_covering(tmp_path,capsys):
+    path = tmp_path / 'a.csv'
+    path.write_text('0,0,0\n1,1,1\n')
+    assert main(['verify', str(path), '-t', '2', '-v', '2']) == 1
+    assert json.loads(capsys.readouterr().out)['covered'] is False
+
+
+def test_bad_arguments_exit_status_2(tmp_path,capsys):
+    assert main(['generate', '-t', '2', '-k', '5', '-v', '3', '--strategy', 'beam', '--beam-width', '0']) == 2
+    assert main(['verify', str(tmp_path / 'missing.csv'), '-t', '2', '-v', '3']) == 2
+    assert main(['verify', str(tmp_path / 'missing.csv')]) == 2
+
+
+def test_bench_prints_one_json_line_per_variant(capsys):
+    assert main(['bench', '-t', '2', '-k', '6', '-v', '3', '--variants', '1,2', '--trials', '4', '--workers', '1']) == 0
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [line['variant'] for line in lines] == [1, 2]
+    assert all(line['trials'] == 4 and line['min'] <= line['mean'] <= line['max'] for line in lines)
+
+
+@pytest.mark.parametrize('fmt', ['csv', 'npy', 'json'])
+def test_generate_piped_into_verify(fmt):
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    generate = subprocess.run([sys.executable, '-m', 'ipo', 'generate', '-t', '3', '-k', '6', '-v', '3', '--seed', '1',
+                               '--format', fmt], capture_output=True, env=env, check=True)
+    verify = subprocess.run([sys.executable, '-m', 'ipo', 'verify', '-', '--format', fmt, '-t', '3', '-v', '3'],
+                            input=generate.stdout, capture_output=True, env=env)
+    assert verify.returncode == 0, verify.stderr
+    assert json.loads(verify.stdout)['covered'] is True
+
+
+def test_peak_memory_reported(capsys):
+    assert main(['generate', '-t', '2', '-k', '6', '-v', '3', '--profile']) == 0
+    assert 'peak memory: ' in capsys.readouterr().err
+    assert main(['bench', '-t', '2', '-k', '6', '-v', '3', '--trials', '2', '--workers', '1']) == 0
+    assert json.loads(capsys.readouterr().out)['peak_bytes'] > 0
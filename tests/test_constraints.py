@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+from ipo import ipo, is_covering_array, Constraints, SEARCH_STRATEGIES, DC
+
+
+def test_complete_avoids_implied_tuples():
+    #0 in column 1 is forbidden with both values of column 0, so no valid row holds it
+    constraints = Constraints([2,2,2],[{0:0,1:0}, {0:1,1:0}])
+    assert constraints.complete([DC,0]) is None
+    assert not constraints.can_hold([1],[0])
+    row = constraints.complete([DC,1])
+    assert row[1] == 1 and not constraints.violates(row)[0]
+
+
+def test_complete_chains_through_columns():
+    #column 2 = 1 forces column 1 to 1, which no value of column 0 allows
+    constraints = Constraints([2,2,2],[{1:0,2:1}, {0:0,1:1}, {0:1,1:1}])
+    assert not constraints.can_hold([2],[1])
+    assert constraints.can_hold([2],[0])
+
+
+def test_complete_keeps_given_cells():
+    constraints = Constraints([3,3,3,3],[{0:0,1:0}, {1:1,2:1}, {2:2,3:2}])
+    rng = np.random.default_rng(0)
+    for _ in range(20):
+        row = constraints.complete([DC,1,DC],rng)
+        assert len(row) == 4 and row[1] == 1
+        assert not constraints.violates(row)[0]
+    assert constraints.complete([0,0]) is None
+
+
+#a few dozen random pairwise forbidden tuples, growth has to steer clear of the tuples they imply
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_ipo_random_pairwise_constraints(seed):
+    rng = np.random.default_rng(seed)
+    spec = []
+    for _ in range(40):
+        a, b = rng.choice(20, 2, replace=False)
+        spec.append({int(a): int(rng.integers(3)), int(b): int(rng.integers(3))})
+    constraints = Constraints([3]*20,spec)
+    ca = ipo(2,20,3,seed=seed,constraints=constraints)
+    assert not constraints.violates(ca).any()
+    assert is_covering_array(ca,2,20,3,constraints=constraints).covered
+
+
+def test_violates_treats_dc_as_undecided():
+    constraints = Constraints([2,2,2],[{0:1,2:1}])
+    rows = np.array([[1,0,1], [1,0,DC], [0,1,1]])
+    assert constraints.violates(rows).tolist() == [True, False, False]
+
+
+def test_predicates_expand_to_forbidden_tuples():
+    constraints = Constraints([3,3],[([0,1], lambda a, b: a != b)])
+    assert constraints.is_forbidden({0:2,1:2})
+    assert not constraints.is_forbidden({0:1,1:2})
+
+
+@pytest.mark.parametrize('fill', ['random', 'greedy'])
+def test_ipo_with_constraints(fill):
+    v = [3,3,2,2,2,2]
+    spec = [{0:0,1:1}, {2:1,3:1}, ([4,5], lambda a, b: a <= b)]
+    ca = ipo(2,6,v,seed=3,fill=fill,constraints=spec)
+    constraints = Constraints(v,spec)
+    assert not constraints.violates(ca).any()
+    assert is_covering_array(ca,2,6,v,constraints=constraints).covered
+
+
+#every value of column 2 is forbidden next to 0 in column 0, so no valid row has 0 there
+@pytest.mark.parametrize('strategy', sorted(SEARCH_STRATEGIES))
+def test_rows_stay_possible_to_complete(strategy):
+    constraints = Constraints([2,2,2],[{0:0,2:0}, {0:0,2:1}])
+    ca = ipo(2,3,2,strategy=strategy,constraints=constraints)
+    assert (ca[:, 0] == 1).all()
+    assert is_covering_array(ca,2,3,2,constraints=constraints).covered
+
+
+def test_no_valid_row_raises_value_error():
+    with pytest.raises(ValueError):
+        ipo(2,3,2,constraints=[{0:0}, {0:1}])
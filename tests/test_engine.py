@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+from ipo import engine, ipo, fill_dc, DC, stride_steps, tapered_stride, IPO_3, is_covering_array, SEARCH_STRATEGIES
+
+
+@pytest.mark.parametrize('strategy', sorted(SEARCH_STRATEGIES))
+@pytest.mark.parametrize('t,k,v,stride', [(2,10,3,1), (3,8,2,2), (2,7,[4,3,3,2,2,2,2],3)])
+def test_ipo_is_covering_array(strategy,t,k,v,stride):
+    ca = ipo(t,k,v,stride,strategy,seed=1)
+    assert ca.shape[1] == k
+    assert is_covering_array(ca,t,k,v).covered
+
+
+#a beam wide enough to keep every candidate searches the whole space like the exhaustive search
+@pytest.mark.parametrize('t,k,v,stride', [(2,10,3,3), (3,9,2,2), (2,8,[4,3,3,2,2,2,2,2],2)])
+def test_full_width_beam_matches_exhaustive_search(t,k,v,stride):
+    exhaustive = ipo(t,k,v,stride,'exhaustive',seed=1)
+    beam = ipo(t,k,v,stride,'beam',beam_width=10**6,seed=1)
+    assert (beam == exhaustive).all()
+
+
+def test_stride_steps_fixed_stride_shortens_last_step():
+    assert list(stride_steps(2,10,3)) == [(2,3), (5,3), (8,2)]
+
+
+def test_stride_steps_sequence_repeats_last_stride():
+    assert list(stride_steps(2,10,[1,2])) == [(2,1), (3,2), (5,2), (7,2), (9,1)]
+
+
+def test_stride_steps_callable_stride():
+    assert list(stride_steps(2,10,lambda i, k: 4)) == [(2,4), (6,4)]
+    assert list(stride_steps(3,10,lambda i, k: i)) == [(3,3), (6,4)]
+
+
+def test_stride_steps_rejects_stride_below_one():
+    with pytest.raises(ValueError):
+        list(stride_steps(2,10,[2,0]))
+
+
+def test_tapered_stride():
+    stride = tapered_stride(4,1)
+    assert stride(0,10) == 4
+    assert stride(9,10) == 1
+    assert list(stride_steps(2,10,stride)) == [(2,3), (5,2), (7,2), (9,1)]
+    ca = ipo(2,10,3,stride,seed=1)
+    assert is_covering_array(ca,2,10,3).covered
+
+
+def test_fixed_stride_wrapper_matches_ipo():
+    assert IPO_3(2,8,3,seed=1) == ipo(2,8,3,3,seed=1).tolist()
+
+
+def test_ipo_same_seed_same_array():
+    assert (ipo(2,12,3,seed=7) == ipo(2,12,3,seed=7)).all()
+
+
+def test_ipo_generator_seed_same_as_int_seed():
+    assert (ipo(2,12,3,2,seed=np.random.default_rng(7)) == ipo(2,12,3,2,seed=7)).all()
+
+
+def test_fill_dc_same_generator_state_same_fill():
+    first = np.full((20, 6), DC)
+    second = first.copy()
+    fill_dc(3,first,np.random.default_rng(3))
+    fill_dc(3,second,np.random.default_rng(3))
+    assert (first == second).all()
+    assert ((first >= 0) & (first < 3)).all()
+
+
+#every column only takes the values of its own alphabet, however the sizes are ordered
+@pytest.mark.parametrize('v', [[2,5,3,2,4,2], [5,4,3,2,2,2], [2,2,2,3,4,5]])
+def test_mixed_alphabets_stay_in_range(v):
+    ca = ipo(2,6,v,2,seed=1)
+    assert ((ca >= 0) & (ca < np.array(v))).all()
+    assert len(ca) >= 5 * 4
+    assert is_covering_array(ca,2,6,v).covered
+
+
+def test_too_few_alphabet_sizes_raises_value_error():
+    with pytest.raises(ValueError):
+        ipo(2,6,[3,3,3],seed=1)
+
+
+def test_beam_width_below_one_raises_value_error():
+    with pytest.raises(ValueError):
+        ipo(2,5,3,strategy='beam',beam_width=0)
+
+
+#the shortlist of rows with don't care values is the same whatever the size of the scored chunks
+def test_greedy_fill_independent_of_chunk_size(monkeypatch):
+    expected = ipo(3,10,3,stride=2,seed=4,fill='greedy')
+    monkeypatch.setattr(engine, 'CANDIDATE_CELLS', 64)
+    assert (ipo(3,10,3,stride=2,seed=4,fill='greedy') == expected).all()
@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+from ipo import ipo, extend, is_covering_array, Constraints, DC
+
+
+def test_extend_keeps_prefix():
+    ca = ipo(2,5,3,seed=1)
+    grown = extend(ca,2,9,3,seed=2)
+    assert (grown[:len(ca), :5] == ca).all()
+    assert is_covering_array(grown,2,9,3).covered
+
+
+def test_extend_keeps_required_rows():
+    ca = ipo(2,4,2,seed=1)
+    required = [[0,1,DC,0,1,1], [DC,DC,DC,DC,0,0]]
+    grown = extend(ca,2,6,2,required=required,seed=1)
+    assert (grown[:len(ca), :4] == ca).all()
+    for r, row in enumerate(required, len(ca)):
+        fixed = np.array(row) != DC
+        assert (grown[r][fixed] == np.array(row)[fixed]).all()
+    assert is_covering_array(grown,2,6,2).covered
+
+
+def test_extend_pinned_value_without_valid_row_raises_value_error():
+    v = [2,2,2,2]
+    constraints = Constraints(v,[{0:0,3:1}, {0:1,3:1}])
+    ca = [[0,0,0], [0,1,1], [1,0,1], [1,1,0]]
+    with pytest.raises(ValueError):
+        extend(ca,2,4,v,required=[[DC,DC,DC,1]],constraints=constraints)
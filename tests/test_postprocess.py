@@ -0,0 +1,128 @@
+import numpy as np
+import pytest
+from itertools import combinations
+from ipo import (ipo, ipo_stream, reduce_rows, stream_rows, order_rows, coverage_curve, rows_for_coverage,
+                 is_covering_array, Constraints)
+
+
+#interactions each row holds, as (columns, values) pairs
+def row_interactions(ca,t):
+    return [{(cols, tuple(int(x) for x in row[list(cols)])) for cols in combinations(range(ca.shape[1]), t)}
+            for row in ca]
+
+
+#greedy order picked one row at a time, ties to the earlier row, with the new interactions of each
+def brute_force_greedy(ca,t):
+    held = row_interactions(ca,t)
+    covered = set()
+    left = list(range(len(ca)))
+    order = []
+    while left:
+        r = max(left, key=lambda r: (len(held[r] - covered), -r))
+        order.append((r, len(held[r] - covered)))
+        covered |= held[r]
+        left.remove(r)
+    return order
+
+
+def test_reduce_rows_keeps_coverage():
+    ca = np.vstack((ipo(3,8,2,seed=1), ipo(3,8,2,seed=2)))
+    reduced = reduce_rows(ca,3,2,passes=1,seed=0)
+    assert len(reduced) < len(ca)
+    assert is_covering_array(reduced,3,8,2).covered
+
+
+#without passes the rows are only dropped, never changed, and a duplicate of every row is redundant
+def test_reduce_rows_drops_duplicates_without_changing_rows():
+    ca = ipo(2,7,3,seed=1)
+    reduced = reduce_rows(np.vstack((ca, ca)),2,3)
+    assert len(reduced) <= len(ca)
+    assert set(map(tuple, reduced.tolist())) <= set(map(tuple, ca.tolist()))
+    assert is_covering_array(reduced,2,7,3).covered
+
+
+def test_reduce_rows_same_seed_same_result():
+    ca = np.vstack((ipo(2,8,3,seed=1), ipo(2,8,3,seed=2)))
+    assert (reduce_rows(ca,2,3,passes=2,seed=5) == reduce_rows(ca,2,3,passes=2,seed=5)).all()
+
+
+def test_reduce_rows_with_constraints():
+    v = [3,3,2,2,2]
+    constraints = Constraints(v,[{0:0,1:1}, {2:1,3:0}])
+    ca = np.vstack((ipo(2,5,v,seed=1,constraints=constraints), ipo(2,5,v,seed=2,constraints=constraints)))
+    reduced = reduce_rows(ca,2,v,passes=2,seed=0,constraints=constraints)
+    assert len(reduced) < len(ca)
+    assert not constraints.violates(reduced).any()
+    assert is_covering_array(reduced,2,5,v,constraints=constraints).covered
+
+
+#two copies of an array, so the second copy of every row adds nothing
+@pytest.mark.parametrize('t,v', [(2,3), (3,2), (2,[4,3,2,2,2,2])])
+def test_stream_rows_most_new_interactions_first(t,v):
+    ca = np.vstack((ipo(t,6,v,seed=1), ipo(t,6,v,seed=2)))
+    streamed = list(stream_rows(ca,t,v))
+    total = len(set().union(*row_interactions(ca,t)))
+    expected = brute_force_greedy(ca,t)
+    zeros = [r for r, new in expected if new == 0]
+    expected = [(r, new) for r, new in expected if new > 0] + [(r, 0) for r in sorted(zeros)]
+    assert [s.new for s in streamed] == [new for r, new in expected]
+    assert all((s.row == ca[r]).all() for s, (r, new) in zip(streamed, expected))
+    assert [s.covered for s in streamed] == list(np.cumsum([s.new for s in streamed]))
+    assert streamed[-1].covered == total
+    assert streamed[-1].coverage == 1.0
+
+
+def test_ipo_stream_yields_ordered_array():
+    streamed = list(ipo_stream(2,8,3,seed=1))
+    ca = ipo(2,8,3,seed=1)
+    assert np.array_equal(np.array([s.row for s in streamed]), order_rows(ca,2,3))
+    assert all(a.new >= b.new for a, b in zip(streamed, streamed[1:]))
+    assert streamed[-1].coverage == 1.0
+
+
+def test_stream_rows_of_no_rows():
+    assert list(stream_rows(np.empty((0, 4), dtype=np.intp),2,3)) == []
+
+
+def test_order_rows_follows_greedy_order():
+    ca = ipo(2,8,3,seed=1)
+    ordered = order_rows(ca,2,3)
+    assert sorted(map(tuple, ordered.tolist())) == sorted(map(tuple, ca.tolist()))
+    assert np.array_equal(ordered, ca[[r for r, new in brute_force_greedy(ca,2)]])
+
+
+@pytest.mark.parametrize('t,v', [(2,3), (3,2), (2,[4,3,2,2,2,2])])
+def test_coverage_curve_counts_first_rows(t,v):
+    ca = ipo(t,6,v,seed=3)
+    held = row_interactions(ca,t)
+    total = len(set().union(*held))
+    expected = [len(set().union(*held[:m+1])) / total for m in range(len(ca))]
+    curve = coverage_curve(ca,t,v)
+    assert np.allclose(curve, expected)
+    assert (np.diff(curve) >= 0).all()
+    assert curve[-1] == 1.0
+
+
+#the first row of the greedy order covers at least as much as any row, and both orders end covering everything
+def test_ordered_curve_starts_higher():
+    ca = ipo(3,8,2,seed=1)
+    before = coverage_curve(ca,3,2)
+    after = coverage_curve(order_rows(ca,3,2),3,2)
+    assert after[0] >= before[0]
+    assert after[-1] == before[-1] == 1.0
+
+
+def test_coverage_curve_with_constraints_reaches_one():
+    v = [3,3,2,2,2]
+    constraints = Constraints(v,[{0:0,1:1}, {2:1,3:0}])
+    ca = ipo(2,5,v,seed=1,constraints=constraints)
+    assert coverage_curve(order_rows(ca,2,v,constraints),2,v,constraints)[-1] == 1.0
+
+
+def test_rows_for_coverage():
+    curve = np.array([0.4, 0.7, 0.9, 1.0])
+    assert rows_for_coverage(curve,0.4) == 1
+    assert rows_for_coverage(curve,0.5) == 2
+    assert rows_for_coverage(curve,0.9) == 3
+    assert rows_for_coverage(curve,1.0) == 4
+    assert rows_for_coverage(curve[:3],1.0) is None
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+from ipo import ipo, extend, GrowthProfile, PHASES, stride_steps
+
+
+@pytest.mark.parametrize('t,k,v,stride', [(2,8,3,2), (3,9,2,3), (2,7,[4,3,3,2,2,2,2],1)])
+def test_profile_counts(t,k,v,stride):
+    profile = GrowthProfile()
+    ca = ipo(t,k,v,stride,seed=1,profile=profile)
+    steps = list(stride_steps(t,k,stride))
+    assert [(s.column, s.num_new) for s in profile.steps] == steps
+    rows = [s.rows for s in profile.steps]
+    added = [s.rows_added for s in profile.steps]
+    assert rows[1:] == list(np.cumsum(added)[:-1] + rows[0])
+    assert rows[-1] + added[-1] == len(ca)
+    for s in profile.steps:
+        assert s.candidates > 0
+        assert s.interactions > 0
+        assert s.covered_horizontally + s.covered_vertically == s.interactions
+        assert set(s.seconds) == set(PHASES)
+        assert all(seconds >= 0 for seconds in s.seconds.values())
+
+
+def test_profile_does_not_change_the_array():
+    assert (ipo(2,10,3,2,seed=5,profile=GrowthProfile()) == ipo(2,10,3,2,seed=5)).all()
+
+
+def test_callback_gets_every_step():
+    seen = []
+    profile = GrowthProfile(callback=seen.append)
+    ipo(2,8,3,seed=1,profile=profile)
+    assert seen == profile.steps
+
+
+def test_extend_profile_starts_at_first_new_column():
+    profile = GrowthProfile()
+    extend(ipo(2,5,3,seed=1),2,8,3,seed=1,profile=profile)
+    assert [s.column for s in profile.steps] == [5, 6, 7]
+
+
+def test_totals_and_summary():
+    profile = GrowthProfile()
+    ipo(2,8,3,2,seed=1,profile=profile)
+    totals = profile.totals()
+    for phase in PHASES:
+        assert totals[phase] == pytest.approx(sum(s.seconds[phase] for s in profile.steps))
+    assert 'initial' in totals
+    assert profile.as_dict()['steps'][0]['column'] == 2
+    assert len(profile.summary().splitlines()) == len(profile.steps) + 2
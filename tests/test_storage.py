@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+from ipo import ipo, save_array, load_array, iter_rows
+
+
+@pytest.mark.parametrize('v', [3, [300,2,2,2]])
+def test_array_round_trip(tmp_path,v):
+    ca = ipo(2,4,v,seed=1)
+    path = tmp_path / 'a.ca'
+    save_array(path,ca,2,v,seed=1,variant=2)
+    stored = load_array(path)
+    assert (stored.t, stored.k, stored.seed, stored.variant) == (2, 4, 1, 2)
+    assert list(stored.v) == list(np.broadcast_to(v, 4))
+    assert (np.asarray(stored.ca) == ca).all()
+    assert (load_array(path,mmap=False).ca == ca).all()
+    assert (np.array(list(iter_rows(stored,chunk_size=5))) == ca).all()
+
+
+def test_load_rejects_other_files(tmp_path):
+    path = tmp_path / 'a.ca'
+    path.write_bytes(b'not an array')
+    with pytest.raises(ValueError):
+        load_array(path)
+
+
+def test_save_rejects_out_of_range_values(tmp_path):
+    with pytest.raises(ValueError):
+        save_array(tmp_path / 'a.ca',[[0,3]],2,3)
+
+
+#values are stored in the smallest unsigned type that holds the largest alphabet, and mapped rather than read
+@pytest.mark.parametrize('v,dtype', [(3, np.uint8), ([300,2,2,2], np.uint16)])
+def test_smallest_dtype_and_mmap(tmp_path,v,dtype):
+    path = tmp_path / 'a.ca'
+    save_array(path,ipo(2,4,v,seed=1),2,v)
+    stored = load_array(path)
+    assert stored.ca.dtype == dtype
+    assert isinstance(stored.ca, np.memmap)
+
+
+def test_empty_array_round_trip(tmp_path):
+    path = tmp_path / 'a.ca'
+    save_array(path,np.empty((0,4), dtype=int),2,3)
+    assert load_array(path).ca.shape == (0, 4)
+    assert list(iter_rows(path)) == []
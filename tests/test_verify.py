@@ -0,0 +1,53 @@
+from itertools import combinations, product
+import numpy as np
+import pytest
+from ipo import verify, ipo, is_covering_array
+
+
+#interactions of an array that no row covers, found one by one
+def brute_force_missing(ca,t,sizes):
+    missing = []
+    for cols in combinations(range(len(sizes)), t):
+        seen = {tuple(int(x) for x in row[list(cols)]) for row in ca}
+        for vals in product(*(range(sizes[c]) for c in cols)):
+            if vals not in seen:
+                missing.append((cols, list(vals)))
+    return missing
+
+
+@pytest.mark.parametrize('t,v', [(2,3), (3,2), (2,[4,3,2,2,2,2])])
+def test_missing_lists_every_absent_interaction(t,v):
+    ca = ipo(t,6,v,seed=1)[3:]
+    sizes = [v] * 6 if isinstance(v, int) else v
+    report = is_covering_array(ca,t,6,v,list_missing=True)
+    expected = brute_force_missing(ca,t,sizes)
+    assert not report.covered and not report
+    assert report.num_missing == len(expected)
+    assert sorted(report.missing) == sorted(expected)
+
+
+def test_missing_only_listed_on_request():
+    report = is_covering_array(ipo(2,5,3,seed=1)[1:],2,5,3)
+    assert report.num_missing > 0
+    assert report.missing is None
+
+
+def test_covering_array_has_nothing_missing():
+    report = is_covering_array(ipo(2,5,3,seed=1).tolist(),2,5,3,list_missing=True)
+    assert report.covered and report
+    assert report.num_missing == 0 and report.missing == []
+
+
+#values outside range(v), like a don't care left in a row, cover nothing
+def test_out_of_range_values_cover_nothing():
+    ca = ipo(2,4,2,seed=1)
+    ca[0, 0] = -1
+    report = is_covering_array(ca,2,4,2,list_missing=True)
+    assert report.num_missing == len(brute_force_missing(np.where(ca < 0, 99, ca),2,[2]*4))
+
+
+def test_same_report_whatever_the_chunk_size(monkeypatch):
+    ca = ipo(3,7,3,seed=2)[5:]
+    report = is_covering_array(ca,3,7,3,list_missing=True)
+    monkeypatch.setattr(verify, 'VERIFY_CHUNK', len(ca) * 3)
+    assert is_covering_array(ca,3,7,3,list_missing=True) == report